@@ -1,13 +1,16 @@
 from .core.maze_state import (
+    MazeChanges,
     MazeOperation,
     MazeOperations,
+    MazeSnapshot,
     MazeState,
     MazeStep,
     MutableMazeState,
 )
 from .core.maze_stepper import MazeStepper
 from .direction import Coordinate, Direction
-from .distances import Distance, Distances, ImmutableDistances
+from .distances import UNREACHED, Distance, Distances, ImmutableDistances
 from .grid import Grid, ImmutableGrid
 from .maze import Maze
+from .maze_file import MazeFileHeader, StoredGrid, load_maze_file, write_maze_file
 from .maze_generator import AlgorithmType, MazeGenerator, MazeOptions
@@ -1,5 +1,11 @@
-from .algorithm import Algorithm
-from .binary_tree import BinaryTree, BinaryTreeRandom
-from .dijkstra import Dijkstra
-from .recursive_backtracker import RecursiveBacktracker, RecursiveBacktrackerRandom
-from .sidewinder import Sidewinder, SidewinderRandom
+from .algorithm import Algorithm, BulkAlgorithm
+from .binary_tree import BinaryTree, BinaryTreeRandom, BulkBinaryTree
+from .dijkstra import BulkDijkstra, Dijkstra
+from .path_index import PathIndex
+from .recursive_backtracker import (
+    BulkRecursiveBacktracker,
+    RecursiveBacktracker,
+    RecursiveBacktrackerRandom,
+)
+from .sidewinder import BulkSidewinder, Sidewinder, SidewinderRandom
+from .tree_diameter import TreeDiameter
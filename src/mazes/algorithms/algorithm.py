@@ -27,3 +27,11 @@ class Algorithm(Protocol):
         """
         for _ in self.maze_steps():
             pass
+
+
+class BulkAlgorithm(Protocol):
+    def generate(self) -> None:
+        """
+        Generates a whole maze directly into its grid, without recording steps.
+        """
+        ...
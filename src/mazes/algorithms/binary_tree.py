@@ -3,18 +3,35 @@ from collections.abc import Iterator
 
 from ..core.maze_state import MazeStep, MutableMazeState
 from ..direction import Direction
+from ..grid import Grid
 from .algorithm import Algorithm
+from .utils import RandomBuffer, set_carved_cells
+
+# Odd coin flips carve north, even coin flips carve east
+_CARVE_TABLE = bytes(Direction.N if i & 1 else Direction.E for i in range(256))
 
 
 class BinaryTreeRandom:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        self._buffer = RandomBuffer(rng)
+
     def choose_direction(self, directions: Direction) -> Direction:
-        return random.choice(list(directions))
+        choices = list(directions)
+        return choices[self._buffer.below(len(choices))]
+
+    def coin_flips(self, count: int) -> bytes:
+        """
+        Returns `count` random bytes. Only the lowest bit of each is used.
+        """
+        return self._buffer.take(count)
 
 
 class BinaryTree(Algorithm):
-    def __init__(self, state: MutableMazeState, random=BinaryTreeRandom()) -> None:
+    def __init__(
+        self, state: MutableMazeState, random: BinaryTreeRandom | None = None
+    ) -> None:
         self._state = state
-        self._random = random
+        self._random = random if random is not None else BinaryTreeRandom()
 
     def maze_steps(self) -> Iterator[MazeStep]:
         state = self._state
@@ -29,9 +46,10 @@ class BinaryTree(Algorithm):
             if Direction.E in valid_dirs:
                 neighbors |= Direction.E
 
-            state.set_run([coord])
-            targets = [dir.update_coordinate(coord) for dir in neighbors]
-            state.set_target_coordinates(targets)
+            if state.records_operations:
+                state.set_run([coord])
+                targets = [dir.update_coordinate(coord) for dir in neighbors]
+                state.set_target_coordinates(targets)
             yield state.pop_maze_step()
 
             if neighbors:
@@ -40,3 +58,34 @@ class BinaryTree(Algorithm):
 
         state.set_run([])
         yield state.pop_maze_step()
+
+
+class BulkBinaryTree:
+    """
+    Generates a Binary Tree maze for the whole grid at once, without recording
+    any steps. Since no cell depends on any other, every cell is carved from a
+    single buffer of coin flips using byte-wide operations.
+    """
+
+    def __init__(self, grid: Grid, random: BinaryTreeRandom | None = None) -> None:
+        self._grid = grid
+        self._random = random if random is not None else BinaryTreeRandom()
+
+    def generate(self) -> None:
+        grid = self._grid
+        width = grid.width
+        height = grid.height
+        size = width * height
+        if size == 0:
+            return
+
+        flips = self._random.coin_flips(size)
+        carved = bytearray(flips.translate(_CARVE_TABLE))
+
+        # The northern row can only carve east, the eastern column can only
+        # carve north, and the northeast corner can carve nowhere.
+        carved[:width] = bytes([Direction.E]) * width
+        carved[slice(width - 1, size, width)] = bytes([Direction.N]) * height
+        carved[width - 1] = Direction.Empty
+
+        set_carved_cells(grid, carved)
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from array import array
 from collections.abc import Iterator
 
 from ..core.maze_state import MazeStep, MutableMazeState
-from ..distances import Distances
+from ..distances import UNREACHED, Distances
 from ..grid import Coordinate, ImmutableGrid
-from .utils import unwrap
+from .tree_diameter import TreeDiameter
+from .utils import neighbor_table, unwrap
 
 
 class Dijkstra:
@@ -131,11 +133,103 @@ class Dijkstra:
         return breadcrumbs
 
     def longest_path(self) -> Distances:
-        new_root = self._distances.max_coordinate
+        diameter = TreeDiameter(self._grid, self._distances.root)
+        diameter.generate()
+        return diameter.path
 
-        new_dijkstra = Dijkstra(self._grid, new_root)
-        new_dijkstra.generate()
-        goal = new_dijkstra._distances.max_coordinate
 
-        path = new_dijkstra.path_to(goal)
-        return path
+class BulkDijkstra:
+    """
+    Computes the distances from `root` with a breadth-first search over flat
+    cell indexes, without recording any steps. Distances are kept in a
+    preallocated integer array, where `UNREACHED` marks cells not yet found,
+    which is shared with `distances` without copying.
+
+    Neighbors are visited in the same order as `Dijkstra`, so the results are
+    the same.
+    """
+
+    def __init__(self, grid: ImmutableGrid, root: Coordinate) -> None:
+        self._grid = grid
+        self._root = root
+        self._values = array("i", [UNREACHED]) * (grid.width * grid.height)
+        self._max_index = grid.index_of(root)
+        self._distances: Distances | None = None
+
+    @property
+    def distances(self) -> Distances:
+        if self._distances is None:
+            grid = self._grid
+            self._distances = Distances.from_flat(
+                grid.width, grid.height, self._root, self._values, self.max_coordinate
+            )
+        return self._distances
+
+    @property
+    def max_coordinate(self) -> Coordinate:
+        return self._grid.coordinate_of(self._max_index)
+
+    @property
+    def max_distance(self) -> int:
+        return max(self._values[self._max_index], 0)
+
+    def generate(self) -> None:
+        grid = self._grid
+        width = grid.width
+        cells = grid.cells
+        values = self._values
+        neighbors = neighbor_table(width)
+
+        root = grid.index_of(self._root)
+        values[root] = 0
+        frontier = [root]
+        max_index = root
+        distance = 0
+
+        while frontier:
+            distance += 1
+            new_frontier: list[int] = []
+
+            for current in frontier:
+                for _, _, offset in neighbors[cells[current]]:
+                    neighbor = current + offset
+                    if values[neighbor] < 0:
+                        values[neighbor] = distance
+                        new_frontier.append(neighbor)
+
+            if new_frontier:
+                max_index = new_frontier[0]
+            frontier = new_frontier
+
+        self._max_index = max_index
+        self._distances = None
+
+    def path_to(self, goal: Coordinate) -> Distances:
+        grid = self._grid
+        width = grid.width
+        cells = grid.cells
+        values = self._values
+        neighbors = neighbor_table(width)
+
+        breadcrumbs = Distances(grid.width, grid.height, self._root)
+        current = grid.index_of(goal)
+        current_distance = values[current]
+        if current_distance == UNREACHED:
+            raise ValueError(f"{goal} is not reachable from {self._root}")
+        breadcrumbs[goal] = current_distance
+
+        while current_distance > 0:
+            for _, _, offset in neighbors[cells[current]]:
+                neighbor = current + offset
+                if values[neighbor] < current_distance:
+                    current = neighbor
+                    current_distance = values[neighbor]
+                    breadcrumbs[grid.coordinate_of(current)] = current_distance
+                    break
+
+        return breadcrumbs
+
+    def longest_path(self) -> Distances:
+        diameter = TreeDiameter(self._grid, self._root)
+        diameter.generate()
+        return diameter.path
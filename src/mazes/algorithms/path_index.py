@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from array import array
+
+from ..distances import UNREACHED
+from ..grid import Coordinate, ImmutableGrid
+from .utils import check_tree_size, neighbor_table
+
+
+class PathIndex:
+    """
+    Answers distance and path queries between any two cells of a perfect
+    maze without searching. The maze is rooted at `root` once, and split into
+    heavy paths, so the lowest common ancestor of two cells is found by
+    climbing at most O(log n) paths.
+
+    The index keeps three 32-bit integers per cell: parent, depth, and the
+    head of the heavy path the cell is on.
+    """
+
+    def __init__(self, grid: ImmutableGrid, root: Coordinate = (0, 0)) -> None:
+        self._grid = grid
+        self._root = root
+        size = grid.width * grid.height
+        self._parents = array("i", [UNREACHED]) * size
+        self._depths = array("i", [UNREACHED]) * size
+        self._heads = array("i", [UNREACHED]) * size
+
+    @property
+    def root(self) -> Coordinate:
+        return self._root
+
+    def generate(self) -> None:
+        grid = self._grid
+        width = grid.width
+        size = width * grid.height
+        cells = grid.cells
+        parents = self._parents
+        depths = self._depths
+        neighbors = neighbor_table(width)
+
+        # Breadth-first, so every parent comes before its children
+        root = grid.index_of(self._root)
+        parents[root] = root
+        depths[root] = 0
+        order = array("i", [root])
+        for current in order:
+            parent = parents[current]
+            depth = depths[current] + 1
+            for _, _, offset in neighbors[cells[current]]:
+                neighbor = current + offset
+                if neighbor != parent:
+                    parents[neighbor] = current
+                    depths[neighbor] = depth
+                    order.append(neighbor)
+            check_tree_size(len(order), size)
+
+        # Each cell's heaviest child continues its heavy path
+        subtree_sizes = array("i", [1]) * size
+        for current in reversed(order):
+            if current != root:
+                subtree_sizes[parents[current]] += subtree_sizes[current]
+        heavy_children = array("i", [UNREACHED]) * size
+        for current in order:
+            parent = parents[current]
+            heavy = heavy_children[parent]
+            if current != root and (
+                heavy == UNREACHED or subtree_sizes[current] > subtree_sizes[heavy]
+            ):
+                heavy_children[parent] = current
+
+        heads = self._heads
+        heads[root] = root
+        for current in order:
+            parent = parents[current]
+            if current != root:
+                is_heavy = heavy_children[parent] == current
+                heads[current] = heads[parent] if is_heavy else current
+
+    def common_ancestor(self, a: Coordinate, b: Coordinate) -> Coordinate:
+        """
+        Returns the cell where the paths from `a` and `b` to the root meet.
+        """
+        grid = self._grid
+        ancestor = self._common_ancestor(self._index_of(a), self._index_of(b))
+        return grid.coordinate_of(ancestor)
+
+    def distance(self, a: Coordinate, b: Coordinate) -> int:
+        depths = self._depths
+        a_index = self._index_of(a)
+        b_index = self._index_of(b)
+        ancestor = self._common_ancestor(a_index, b_index)
+        return depths[a_index] + depths[b_index] - 2 * depths[ancestor]
+
+    def path(self, a: Coordinate, b: Coordinate) -> list[Coordinate]:
+        """
+        Returns the cells along the path from `a` to `b`, including both.
+        """
+        grid = self._grid
+        parents = self._parents
+        a_index = self._index_of(a)
+        b_index = self._index_of(b)
+        ancestor = self._common_ancestor(a_index, b_index)
+
+        up = [a_index]
+        while up[-1] != ancestor:
+            up.append(parents[up[-1]])
+        down = [b_index]
+        while down[-1] != ancestor:
+            down.append(parents[down[-1]])
+        down.pop()
+        down.reverse()
+
+        return [grid.coordinate_of(index) for index in up + down]
+
+    def _index_of(self, coordinate: Coordinate) -> int:
+        grid = self._grid
+        if not grid.is_valid_coordinate(coordinate):
+            raise IndexError(coordinate)
+        index = grid.index_of(coordinate)
+        if self._depths[index] == UNREACHED:
+            raise ValueError(f"{coordinate} is not reachable from {self._root}")
+        return index
+
+    def _common_ancestor(self, a: int, b: int) -> int:
+        parents = self._parents
+        depths = self._depths
+        heads = self._heads
+
+        while heads[a] != heads[b]:
+            if depths[heads[a]] > depths[heads[b]]:
+                a = parents[heads[a]]
+            else:
+                b = parents[heads[b]]
+
+        return a if depths[a] < depths[b] else b
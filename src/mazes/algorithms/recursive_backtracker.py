@@ -1,31 +1,44 @@
 import logging
 import random
+from array import array
 from collections.abc import Iterator
 
 from ..core.maze_state import MazeStep, MutableMazeState
 from ..direction import Direction
-from ..grid import Coordinate, ImmutableGrid
+from ..grid import Coordinate, Grid, ImmutableGrid
 from .algorithm import Algorithm
+from .utils import RandomBuffer, in_grid_directions, neighbor_table
 
 
 class RecursiveBacktrackerRandom:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        self._buffer = RandomBuffer(rng)
+
     def random_coordinate(self, grid: ImmutableGrid) -> Coordinate:
-        x = random.randrange(0, grid.width)
-        y = random.randrange(0, grid.height)
+        x = self._buffer.below(grid.width)
+        y = self._buffer.below(grid.height)
         return (x, y)
 
     def choose_direction(self, directions: Direction) -> Direction:
-        return random.choice(list(directions))
+        choices = list(directions)
+        return choices[self.choose_direction_offset(len(choices))]
+
+    def choose_direction_offset(self, count: int) -> int:
+        """
+        Returns the offset of the direction to take, out of `count` available
+        directions in N, S, E, W order.
+        """
+        return self._buffer.below(count)
 
 
 class RecursiveBacktracker(Algorithm):
     def __init__(
         self,
         state: MutableMazeState,
-        random=RecursiveBacktrackerRandom(),
+        random: RecursiveBacktrackerRandom | None = None,
     ) -> None:
         self._state = state
-        self._random = random
+        self._random = random if random is not None else RecursiveBacktrackerRandom()
         self._logger = logging.getLogger(__name__)
 
     def maze_steps(self) -> Iterator[MazeStep]:
@@ -47,8 +60,11 @@ class RecursiveBacktracker(Algorithm):
                 yield state.pop_maze_step()
                 state.pop_run()
             else:
-                targets = self.targets_from_directions(current, available_directions)
-                state.set_target_coordinates(targets)
+                if state.records_operations:
+                    targets = self.targets_from_directions(
+                        current, available_directions
+                    )
+                    state.set_target_coordinates(targets)
                 yield state.pop_maze_step()
 
                 next_direction = random.choose_direction(available_directions)
@@ -63,3 +79,55 @@ class RecursiveBacktracker(Algorithm):
     ) -> list[Coordinate]:
         targets = [dir.update_coordinate(coord) for dir in directions]
         return targets
+
+
+class BulkRecursiveBacktracker:
+    """
+    Generates a Recursive Backtracker maze without recording any steps. Cells
+    are flat indexes into the grid's link bytes, which double as the set of
+    visited cells, and the stack is a compact array of indexes.
+
+    Directions are offered to the random strategy in the same order as
+    `RecursiveBacktracker`, so the same seed gives the same maze.
+    """
+
+    def __init__(
+        self, grid: Grid, random: RecursiveBacktrackerRandom | None = None
+    ) -> None:
+        self._grid = grid
+        self._random = random if random is not None else RecursiveBacktrackerRandom()
+
+    def generate(self) -> None:
+        grid = self._grid
+        width = grid.width
+        size = width * grid.height
+        if size == 0:
+            return
+
+        neighbors = neighbor_table(width)
+        directions = in_grid_directions(width, grid.height)
+
+        links = bytearray(size)
+        choose_direction_offset = self._random.choose_direction_offset
+        start_at = grid.index_of(self._random.random_coordinate(grid))
+        stack = array("I", [start_at])
+
+        while stack:
+            current = stack[-1]
+            available = [
+                (direction, opposite, current + offset)
+                for direction, opposite, offset in neighbors[directions[current]]
+                if not links[current + offset]
+            ]
+
+            if not available:
+                stack.pop()
+                continue
+
+            choice = choose_direction_offset(len(available))
+            direction, opposite, neighbor = available[choice]
+            links[current] |= direction
+            links[neighbor] |= opposite
+            stack.append(neighbor)
+
+        grid.set_cells(links)
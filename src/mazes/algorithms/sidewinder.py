@@ -3,26 +3,46 @@ from collections.abc import Iterator, Sequence
 
 from ..core.maze_state import MazeStep, MutableMazeState
 from ..direction import Direction
-from ..grid import Coordinate
+from ..grid import Coordinate, Grid
 from .algorithm import Algorithm
+from .utils import RandomBuffer, set_carved_cells
+
+# Odd coin flips close out the run, even coin flips carve east
+_CARVE_TABLE = bytes(0 if i & 1 else Direction.E for i in range(256))
 
 
 class SidewinderRandom:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        self._buffer = RandomBuffer(rng)
+
     def should_close_out(self) -> bool:
-        return random.randint(0, 1) == 1
+        return self._buffer.below(2) == 1
 
     def choose_north(self, coords: Sequence[Coordinate]) -> Coordinate:
-        return random.choice(coords)
+        return coords[self._buffer.below(len(coords))]
+
+    def close_out_flips(self, count: int) -> bytes:
+        """
+        Returns `count` random bytes. An odd byte means the run should be
+        closed out.
+        """
+        return self._buffer.take(count)
+
+    def choose_north_offset(self, length: int) -> int:
+        """
+        Returns the offset of the run member to carve north from.
+        """
+        return self._buffer.below(length)
 
 
 class Sidewinder(Algorithm):
     def __init__(
         self,
         state: MutableMazeState,
-        random=SidewinderRandom(),
+        random: SidewinderRandom | None = None,
     ) -> None:
         self._state = state
-        self._random = random
+        self._random = random if random is not None else SidewinderRandom()
 
     def maze_steps(self) -> Iterator[MazeStep]:
         state = self._state
@@ -45,20 +65,84 @@ class Sidewinder(Algorithm):
                 )
 
                 if should_close_out:
-                    targets = [
-                        Direction.N.update_coordinate(coord) for coord in state.run
-                    ]
-                    state.set_target_coordinates(targets)
+                    if state.records_operations:
+                        targets = [
+                            Direction.N.update_coordinate(coord) for coord in state.run
+                        ]
+                        state.set_target_coordinates(targets)
                     yield state.pop_maze_step()
 
                     member = random.choose_north(state.run)
                     state.grid_link(member, Direction.N)
                     state.set_run([])
                 else:
-                    targets = [Direction.E.update_coordinate(coord)]
-                    state.set_target_coordinates(targets)
+                    if state.records_operations:
+                        targets = [Direction.E.update_coordinate(coord)]
+                        state.set_target_coordinates(targets)
                     yield state.pop_maze_step()
 
                     state.grid_link(coord, Direction.E)
 
         yield state.pop_maze_step()
+
+
+class BulkSidewinder:
+    """
+    Generates a Sidewinder maze a row at a time, without recording any steps.
+    Runs are found with byte-wide operations on each row's coin flips, so only
+    the north carve of each run is chosen in Python.
+
+    Rows are carved bottom first, like `Sidewinder`, but each row draws all of
+    its close-out flips before choosing any north carves, where `Sidewinder`
+    interleaves them. So the same seed gives a different maze, but the same
+    close-outs and north choices give the same maze.
+    """
+
+    def __init__(self, grid: Grid, random: SidewinderRandom | None = None) -> None:
+        self._grid = grid
+        self._random = random if random is not None else SidewinderRandom()
+
+    def generate(self) -> None:
+        grid = self._grid
+        width = grid.width
+        size = width * grid.height
+        if size == 0:
+            return
+
+        carved = bytearray(size)
+        for y in reversed(range(grid.height)):
+            row = slice(y * width, (y + 1) * width)
+            carved[row] = self.carve_row(y)
+
+        set_carved_cells(grid, carved)
+
+    def carve_row(self, y: int) -> bytearray:
+        """
+        Returns the north and east links carved by each cell of row `y`. Rows
+        do not depend on each other, so separate workers may carve separate
+        rows, given their own random strategies.
+        """
+        width = self._grid.width
+        random = self._random
+
+        if y == 0:
+            # The northern row is a single run carved all the way east
+            row = bytearray([Direction.E]) * width
+            row[-1] = Direction.Empty
+            return row
+
+        flips = random.close_out_flips(width - 1)
+        row = bytearray(flips.translate(_CARVE_TABLE))
+        # The eastern boundary always closes out the run
+        row.append(Direction.Empty)
+
+        north = int(Direction.N)
+        choose_north_offset = random.choose_north_offset
+        run_start = 0
+        while run_start < width:
+            run_end = row.index(0, run_start)
+            member = run_start + choose_north_offset(run_end - run_start + 1)
+            row[member] |= north
+            run_start = run_end + 1
+
+        return row
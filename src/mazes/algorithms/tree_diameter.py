@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from array import array
+
+from ..distances import UNREACHED, Distances
+from ..grid import Coordinate, ImmutableGrid
+from .utils import check_tree_size, neighbor_table, unwrap
+
+# Number of cells reset at a time when reusing the scratch array
+_FILL_CHUNK = 1 << 16
+
+
+class TreeDiameter:
+    """
+    Finds the longest path through a perfect maze, where every two cells are
+    joined by exactly one path. A breadth-first sweep from `start` finds one
+    end of the longest path, and a second sweep from there finds the other.
+
+    Both sweeps only track the parent of each cell, so they share a single
+    scratch array, which is then reused to hold the distances along the path.
+    No `MutableMazeState` is needed.
+    """
+
+    def __init__(self, grid: ImmutableGrid, start: Coordinate = (0, 0)) -> None:
+        self._grid = grid
+        self._start = start
+        self._path: Distances | None = None
+
+    @property
+    def endpoints(self) -> tuple[Coordinate, Coordinate]:
+        path = unwrap(self._path)
+        return (path.root, path.max_coordinate)
+
+    @property
+    def length(self) -> int:
+        return unwrap(self._path).max_distance
+
+    @property
+    def path(self) -> Distances:
+        """
+        The distance of each cell along the longest path from its first
+        endpoint. Cells off the path are unreached.
+        """
+        return unwrap(self._path)
+
+    def generate(self) -> None:
+        grid = self._grid
+        scratch = array("i", [UNREACHED]) * (grid.width * grid.height)
+
+        first, _ = self._sweep(grid.index_of(self._start), scratch)
+        last, length = self._sweep(first, scratch)
+
+        # Follow the parents back from the far end before they're overwritten
+        path = array("i", [last])
+        current = last
+        while current != first:
+            current = scratch[current]
+            path.append(current)
+
+        self._fill(scratch, UNREACHED)
+        for index in path:
+            scratch[index] = length
+            length -= 1
+
+        self._path = Distances.from_flat(
+            grid.width,
+            grid.height,
+            grid.coordinate_of(first),
+            scratch,
+            grid.coordinate_of(last),
+        )
+
+    def _sweep(self, root: int, parents: array) -> tuple[int, int]:
+        """
+        Records the parent of every cell reachable from `root`, returning the
+        farthest cell and its distance.
+        """
+        grid = self._grid
+        width = grid.width
+        size = width * grid.height
+        cells = grid.cells
+        neighbors = neighbor_table(width)
+
+        parents[root] = root
+        frontier = [root]
+        farthest = root
+        distance = 0
+        visited = 1
+
+        while True:
+            new_frontier: list[int] = []
+
+            for current in frontier:
+                parent = parents[current]
+                for _, _, offset in neighbors[cells[current]]:
+                    neighbor = current + offset
+                    if neighbor != parent:
+                        parents[neighbor] = current
+                        new_frontier.append(neighbor)
+
+            if not new_frontier:
+                return (farthest, distance)
+
+            visited += len(new_frontier)
+            check_tree_size(visited, size)
+
+            farthest = new_frontier[0]
+            distance += 1
+            frontier = new_frontier
+
+    def _fill(self, values: array, value: int) -> None:
+        if not values:
+            return
+
+        chunk = array("i", [value]) * min(len(values), _FILL_CHUNK)
+        for start in range(0, len(values), len(chunk)):
+            stop = min(start + len(chunk), len(values))
+            values[start:stop] = chunk[: stop - start]
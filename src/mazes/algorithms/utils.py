@@ -1,8 +1,21 @@
+import random
 from itertools import chain
 from typing import TypeVar
 
+from ..direction import Direction
+from ..grid import Grid
+from ..utils import bytewise_or
+
 T = TypeVar("T")
 
+# A neighbor of a cell, as its direction, the direction back, and the offset
+# of its flat index from the cell's
+Neighbor = tuple[int, int, int]
+
+# Map the links a cell carves to the links they open into its neighbors
+_FROM_SOUTH_TABLE = bytes(Direction.S if i & Direction.N else 0 for i in range(256))
+_FROM_WEST_TABLE = bytes(Direction.W if i & Direction.E else 0 for i in range(256))
+
 
 def unwrap(x: T | None) -> T:
     assert x is not None
@@ -11,3 +24,119 @@ def unwrap(x: T | None) -> T:
 
 def flatten(lst: list[list[T]]) -> list[T]:
     return list(chain.from_iterable(lst))
+
+
+def neighbor_table(width: int) -> list[tuple[Neighbor, ...]]:
+    """
+    For every set of links, the neighbors they lead to, in the order N, S, E,
+    W, for a grid `width` cells wide. A neighbor of the cell at flat index
+    `current` is at `current + offset`.
+    """
+    neighbors = [
+        (int(Direction.N), int(Direction.S), -width),
+        (int(Direction.S), int(Direction.N), width),
+        (int(Direction.E), int(Direction.W), 1),
+        (int(Direction.W), int(Direction.E), -1),
+    ]
+    return [
+        tuple(neighbor for neighbor in neighbors if links & neighbor[0])
+        for links in range(Direction.All + 1)
+    ]
+
+
+def in_grid_directions(width: int, height: int) -> bytearray:
+    """
+    The directions from each cell, in row-major order, that lead to another
+    cell rather than off the grid.
+    """
+    directions = bytearray([Direction.All]) * (width * height)
+    if not directions:
+        return directions
+    edges = [
+        (slice(0, width), Direction.N),
+        (slice((height - 1) * width, None), Direction.S),
+        (slice(width - 1, None, width), Direction.E),
+        (slice(0, None, width), Direction.W),
+    ]
+    for edge, direction in edges:
+        without = bytes(links & ~direction for links in range(256))
+        directions[edge] = directions[edge].translate(without)
+    return directions
+
+
+def check_tree_size(visited: int, size: int) -> None:
+    """
+    Raises if a search that never goes back to a cell's parent has visited
+    more than every cell, which only a loop allows.
+    """
+    if visited > size:
+        raise ValueError("Maze has a loop, so it is not a perfect maze")
+
+
+def set_carved_cells(grid: Grid, carved: bytes | bytearray) -> None:
+    """
+    Sets every cell of `grid` from `carved`, which holds the north and east
+    links carved by each cell in row-major order. The matching south and west
+    links of the neighbors are added here.
+    """
+    width = grid.width
+    if not carved:
+        return
+
+    from_south = carved[width:].translate(_FROM_SOUTH_TABLE) + bytes(width)
+    from_west = bytes(1) + carved[:-1].translate(_FROM_WEST_TABLE)
+
+    grid.set_cells(bytewise_or(carved, from_south, from_west))
+
+
+class RandomBuffer:
+    """
+    Draws small random numbers from a buffer of random bytes, which is refilled
+    from `rng` in batches, so most draws do not call the generator at all.
+
+    Without `rng`, a generator is seeded from the `random` module when the first
+    number is drawn, so draws still follow `random.seed` without taking a whole
+    batch from its shared generator.
+    """
+
+    def __init__(self, rng: random.Random | None = None, batch_size=4096) -> None:
+        self._rng = rng
+        self._batch_size = batch_size
+        self._buffer = b""
+        self._index = 0
+
+    @property
+    def rng(self) -> random.Random:
+        if self._rng is None:
+            self._rng = random.Random(random.getrandbits(64))
+        return self._rng
+
+    def below(self, n: int) -> int:
+        """
+        Returns a random integer in `range(n)`. Bytes that would bias the
+        result are skipped.
+        """
+        if n == 1:
+            return 0
+        if n > 256:
+            return self.rng.randrange(n)
+
+        limit = 256 - 256 % n
+        while True:
+            if self._index == len(self._buffer):
+                self._buffer = self.rng.randbytes(self._batch_size)
+                self._index = 0
+            byte = self._buffer[self._index]
+            self._index += 1
+            if byte < limit:
+                return byte % n
+
+    def take(self, count: int) -> bytes:
+        """
+        Returns the next `count` random bytes.
+        """
+        buffered = self._buffer[slice(self._index, self._index + count)]
+        self._index += len(buffered)
+        if len(buffered) < count:
+            buffered += self.rng.randbytes(count - len(buffered))
+        return buffered
@@ -0,0 +1,353 @@
+"""
+Benchmarks for generating, solving and rendering mazes at increasing sizes.
+
+    maze-bench [--sizes 10,100,500,1000,2000] [--json results.json]
+
+Each benchmark reports its best wall time over the repeats, its peak traced
+memory, and how many steps or cells it processed per second.
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from importlib import metadata
+
+from .algorithms import (
+    BinaryTree,
+    BinaryTreeRandom,
+    BulkBinaryTree,
+    BulkDijkstra,
+    BulkRecursiveBacktracker,
+    BulkSidewinder,
+    Dijkstra,
+    RecursiveBacktracker,
+    RecursiveBacktrackerRandom,
+    Sidewinder,
+    SidewinderRandom,
+    TreeDiameter,
+)
+from .core.maze_state import MutableMazeState
+from .core.maze_stepper import MazeStepper
+from .grid import Grid
+from .renderers import ImageRenderer, TextRenderer
+
+# A benchmark is prepared for a size, outside of the timing, and returns the
+# run to time, which returns how many steps or cells it processed
+Run = Callable[[], int]
+Prepare = Callable[[int], Run]
+
+
+@dataclass(frozen=True, slots=True)
+class Benchmark:
+    name: str
+    unit: str
+    prepare: Prepare
+    # Benchmarks that record every step are limited by `--stepping-limit`
+    stepping: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class BenchmarkResult:
+    name: str
+    size: int
+    seconds: float
+    peak_bytes: int | None
+    count: int
+    unit: str
+
+    @property
+    def rate(self) -> float:
+        return self.count / self.seconds if self.seconds > 0 else 0.0
+
+
+_STEPPING = {
+    "binary-tree": (BinaryTree, BinaryTreeRandom),
+    "sidewinder": (Sidewinder, SidewinderRandom),
+    "recursive-backtracker": (RecursiveBacktracker, RecursiveBacktrackerRandom),
+}
+_BULK = {
+    "binary-tree": (BulkBinaryTree, BinaryTreeRandom),
+    "sidewinder": (BulkSidewinder, SidewinderRandom),
+    "recursive-backtracker": (BulkRecursiveBacktracker, RecursiveBacktrackerRandom),
+}
+
+
+def _seeded_grid(size: int) -> Grid:
+    """
+    A Recursive Backtracker maze with a fixed seed, for the benchmarks that
+    solve or render one.
+    """
+    grid = Grid(size, size)
+    BulkRecursiveBacktracker(
+        grid, RecursiveBacktrackerRandom(random.Random(1))
+    ).generate()
+    return grid
+
+
+def _generate_stepping(name: str) -> Prepare:
+    algorithm_class, random_class = _STEPPING[name]
+
+    def prepare(size: int) -> Run:
+        state = MutableMazeState(Grid(size, size), (0, 0))
+        algorithm = algorithm_class(state, random_class(random.Random(1)))
+        stepper = MazeStepper(state, algorithm.maze_steps())
+
+        def run() -> int:
+            steps = 0
+            while stepper.step_forward():
+                steps += 1
+            return steps
+
+        return run
+
+    return prepare
+
+
+def _generate_headless(name: str) -> Prepare:
+    algorithm_class, random_class = _STEPPING[name]
+
+    def prepare(size: int) -> Run:
+        state = MutableMazeState(Grid(size, size), (0, 0), records_operations=False)
+        algorithm = algorithm_class(state, random_class(random.Random(1)))
+
+        def run() -> int:
+            return sum(1 for _ in algorithm.maze_steps())
+
+        return run
+
+    return prepare
+
+
+def _generate_bulk(name: str) -> Prepare:
+    algorithm_class, random_class = _BULK[name]
+
+    def prepare(size: int) -> Run:
+        algorithm = algorithm_class(Grid(size, size), random_class(random.Random(1)))
+
+        def run() -> int:
+            algorithm.generate()
+            return size * size
+
+        return run
+
+    return prepare
+
+
+def _dijkstra_stepping(size: int) -> Run:
+    dijkstra = Dijkstra(_seeded_grid(size), (0, 0))
+
+    def run() -> int:
+        return sum(1 for _ in dijkstra.steps())
+
+    return run
+
+
+def _dijkstra_bulk(size: int) -> Run:
+    dijkstra = BulkDijkstra(_seeded_grid(size), (0, 0))
+
+    def run() -> int:
+        dijkstra.generate()
+        return size * size
+
+    return run
+
+
+def _longest_path(size: int) -> Run:
+    diameter = TreeDiameter(_seeded_grid(size), (0, 0))
+
+    def run() -> int:
+        diameter.generate()
+        return size * size
+
+    return run
+
+
+def _render_text(size: int) -> Run:
+    grid = _seeded_grid(size)
+    dijkstra = BulkDijkstra(grid, (0, 0))
+    dijkstra.generate()
+    renderer = TextRenderer(grid, dijkstra.distances)
+
+    def run() -> int:
+        renderer.write(_NullText())
+        return size * size
+
+    return run
+
+
+def _render_png(overlay: bool) -> Prepare:
+    def prepare(size: int) -> Run:
+        grid = _seeded_grid(size)
+        distances = None
+        if overlay:
+            dijkstra = BulkDijkstra(grid, (0, 0))
+            dijkstra.generate()
+            distances = dijkstra.distances
+        renderer = ImageRenderer(grid, distances)
+
+        def run() -> int:
+            renderer.write_png(_NullBinary())
+            return size * size
+
+        return run
+
+    return prepare
+
+
+class _NullText(io.StringIO):
+    def write(self, text: str) -> int:
+        return len(text)
+
+
+class _NullBinary(io.BytesIO):
+    def write(self, data) -> int:
+        return len(data)
+
+
+def benchmarks() -> list[Benchmark]:
+    suite: list[Benchmark] = []
+    for name in _STEPPING:
+        suite += [
+            Benchmark(
+                f"generate/{name}/stepping", "steps", _generate_stepping(name), True
+            ),
+            Benchmark(
+                f"generate/{name}/headless", "steps", _generate_headless(name), True
+            ),
+            Benchmark(f"generate/{name}/bulk", "cells", _generate_bulk(name)),
+        ]
+    suite += [
+        Benchmark("solve/dijkstra/stepping", "steps", _dijkstra_stepping, True),
+        Benchmark("solve/dijkstra/bulk", "cells", _dijkstra_bulk),
+        Benchmark("solve/longest-path", "cells", _longest_path),
+        Benchmark("render/text", "cells", _render_text),
+        Benchmark("render/png", "cells", _render_png(False)),
+        Benchmark("render/png-overlay", "cells", _render_png(True)),
+    ]
+    return suite
+
+
+def run_benchmark(
+    benchmark: Benchmark, size: int, repeat=1, measure_memory=True
+) -> BenchmarkResult:
+    best = float("inf")
+    count = 0
+    for _ in range(repeat):
+        run = benchmark.prepare(size)
+        start = time.perf_counter()
+        count = run()
+        best = min(best, time.perf_counter() - start)
+
+    peak_bytes = None
+    if measure_memory:
+        # Tracing slows everything down, so it gets a run of its own
+        run = benchmark.prepare(size)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak_bytes = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult(
+        benchmark.name, size, best, peak_bytes, count, benchmark.unit
+    )
+
+
+def run_suite(
+    sizes: list[int],
+    stepping_limit: int | None = None,
+    selected: str | None = None,
+    repeat=1,
+    measure_memory=True,
+    report: Callable[[BenchmarkResult], None] | None = None,
+) -> list[BenchmarkResult]:
+    """
+    Runs every benchmark whose name contains `selected` at every size.
+    Benchmarks that record steps are skipped above `stepping_limit`.
+    """
+    results = []
+    for benchmark in benchmarks():
+        if selected is not None and selected not in benchmark.name:
+            continue
+        for size in sizes:
+            if benchmark.stepping and stepping_limit and size > stepping_limit:
+                continue
+            result = run_benchmark(benchmark, size, repeat, measure_memory)
+            if report is not None:
+                report(result)
+            results.append(result)
+    return results
+
+
+def results_to_json(results: list[BenchmarkResult]) -> dict:
+    return {
+        "version": metadata.version("mazes"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "results": [asdict(result) | {"rate": result.rate} for result in results],
+    }
+
+
+def print_result(result: BenchmarkResult) -> None:
+    size = f"{result.size}x{result.size}"
+    memory = (
+        f"{result.peak_bytes / 2**20:>9.1f} MiB"
+        if result.peak_bytes is not None
+        else f"{'-':>13}"
+    )
+    print(
+        f"{result.name:<42}{size:>11}{result.seconds:>11.4f}s{memory}"
+        f"{result.rate:>14,.0f} {result.unit}/s",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the maze algorithms")
+    parser.add_argument(
+        "--sizes",
+        type=lambda sizes: [int(size) for size in sizes.split(",")],
+        default=[10, 100, 500, 1000, 2000],
+        help="Comma-separated grid sizes",
+    )
+    parser.add_argument(
+        "--stepping-limit",
+        type=int,
+        default=500,
+        help="Largest size for benchmarks that record steps. 0 for no limit.",
+    )
+    parser.add_argument("-k", "--select", help="Only run benchmarks with this in")
+    parser.add_argument("-r", "--repeat", type=int, default=1)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Skip measuring peak memory"
+    )
+    parser.add_argument("--json", help="Write the results to this file")
+    args = parser.parse_args()
+
+    results = run_suite(
+        args.sizes,
+        args.stepping_limit,
+        args.select,
+        args.repeat,
+        not args.no_memory,
+        print_result,
+    )
+    if args.json is not None:
+        with open(args.json, "w") as file:
+            json.dump(results_to_json(results), file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,15 @@
 import argparse
+import hashlib
+import json
+import os
 import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 from .maze import Maze
+from .maze_file import write_maze_file
+from .maze_generator import AlgorithmType
 
 
 class CommandError(Exception):
@@ -18,6 +24,12 @@ class CommandLine:
         self.output: str | None = None
         self.overlay_type: str | None = None
         self.algorithm = "binary_tree"
+        self.bits_per_cell = 8
+        self.count: int | None = None
+        self.jobs: int | None = None
+        self.output_dir: str | None = None
+        self.format = "txt"
+        self.bulk = False
 
     def execute(self) -> int:
         try:
@@ -36,7 +48,17 @@ class CommandLine:
         parser.add_argument("height", type=int, help="Height of the maze")
         parser.add_argument("-s", "--seed", type=int, help="Random number seed")
         parser.add_argument(
-            "-o", "--output", type=str, help="Output file. Supports .txt and .png."
+            "-o",
+            "--output",
+            type=str,
+            help="Output file. Supports .txt, .png and .maze.",
+        )
+        parser.add_argument(
+            "--bits",
+            type=int,
+            choices=[4, 8],
+            default=8,
+            help="Bits per cell in .maze files. Only 8 can be memory-mapped.",
         )
         algorithms = ["binary-tree", "sidewinder", "recursive-backtracker"]
         parser.add_argument(
@@ -45,6 +67,34 @@ class CommandLine:
         parser.add_argument(
             "-O", "--overlay", choices=["none", "distance", "path", "max", "longest"]
         )
+        parser.add_argument(
+            "-b",
+            "--bulk",
+            action="store_true",
+            help=(
+                "Generate in one pass. Except with the recursive backtracker, "
+                "the same seed gives a different maze."
+            ),
+        )
+        parser.add_argument(
+            "-n", "--count", type=int, help="Number of mazes to generate in a batch"
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Processes for a batch. Defaults to all CPUs.",
+        )
+        parser.add_argument(
+            "-d", "--output-dir", type=str, help="Output directory for a batch"
+        )
+        parser.add_argument(
+            "-f",
+            "--format",
+            choices=["txt", "png", "maze"],
+            default="txt",
+            help="Output format for a batch",
+        )
 
         args = parser.parse_args()
 
@@ -54,19 +104,88 @@ class CommandLine:
         self.output = args.output
         self.overlay_type = args.overlay
         self.algorithm = args.algorithm
+        self.bits_per_cell = args.bits
+        self.count = args.count
+        self.jobs = args.jobs
+        self.output_dir = args.output_dir
+        self.format = args.format
+        self.bulk = args.bulk
 
     def run(self) -> None:
+        if self.count is not None:
+            self.run_batch()
+            return
+
         seed = self.setup_seed()
-        maze = self.generate_maze()
-        self.output_maze(maze)
+        maze = self.generate_maze(seed)
+        self.output_maze(maze, seed, self.output)
         print(f"Seed: {seed}")
 
-    def generate_maze(self) -> Maze:
+    def run_batch(self) -> None:
+        """
+        Generates `count` mazes across a process pool. Each maze has its own
+        seed derived from the base seed, so it can be regenerated on its own
+        with `--seed`, and `--bulk` if the batch was bulk generated. The seeds
+        and files are listed in `manifest.json`.
+        """
+        count = self.count or 0
+        if count < 1:
+            raise CommandError("The count must be at least 1")
+        if self.output is not None:
+            raise CommandError("Use --output-dir instead of --output in a batch")
+        if self.output_dir is None:
+            raise CommandError("A batch needs an --output-dir")
+
+        base_seed = self.setup_seed()
+        output_dir = Path(self.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        digits = len(str(count - 1))
+        indexes = range(count)
+        seeds = [derive_seed(base_seed, index) for index in indexes]
+        files = [f"maze-{index:0{digits}}.{self.format}" for index in indexes]
+        paths = [str(output_dir / file) for file in files]
+
+        jobs = self.jobs or os.cpu_count() or 1
+        if jobs == 1:
+            for seed, path in zip(seeds, paths):
+                self.generate_batch_maze(seed, path)
+        else:
+            chunksize = max(1, count // (jobs * 4))
+            with ProcessPoolExecutor(jobs) as executor:
+                for _ in executor.map(
+                    self.generate_batch_maze, seeds, paths, chunksize=chunksize
+                ):
+                    pass
+
+        manifest = {
+            "seed": base_seed,
+            "width": self.width,
+            "height": self.height,
+            "algorithm": self.algorithm,
+            "overlay": self.overlay_type,
+            "bulk": self.bulk,
+            "mazes": [
+                {"index": index, "seed": seed, "file": file}
+                for index, seed, file in zip(indexes, seeds, files)
+            ],
+        }
+        with open(output_dir / "manifest.json", "w") as file:
+            json.dump(manifest, file, indent=2)
+        print(f"Seed: {base_seed}")
+
+    def generate_batch_maze(self, seed: int, path: str) -> None:
+        maze = self.generate_maze(seed)
+        self.output_maze(maze, seed, path)
+
+    def generate_maze(self, seed: int) -> Maze:
         maze = Maze.generate(
             self.width,
             self.height,
             self.maze_algorithm_type(),
             self.maze_overlay_type(),
+            bulk=self.bulk,
+            rng=random.Random(seed),
         )
         return maze
 
@@ -80,7 +199,7 @@ class CommandLine:
                 return Maze.OverlayType.PathToMax
             case "longest":
                 return Maze.OverlayType.LongestPath
-            case None:
+            case "none" | None:
                 return Maze.OverlayType.Nothing
             case unknown:
                 raise ValueError(unknown)
@@ -96,34 +215,45 @@ class CommandLine:
             case unknown:
                 raise ValueError(unknown)
 
-    def output_maze(self, maze: Maze) -> None:
-        output = self.output
-
+    def output_maze(self, maze: Maze, seed: int, output: str | None) -> None:
         if output is None or output == "-":
-            text = str(maze)
-            print(text)
+            maze.write_text(sys.stdout)
+            print()
             return
 
         path = Path(output)
         if path.suffix == ".txt":
-            text = str(maze)
-            path.write_text(text)
+            with path.open("w") as file:
+                maze.write_text(file)
             return
 
         if path.suffix == ".png":
             maze.write_png(str(path))
             return
 
+        if path.suffix == ".maze":
+            algorithm = AlgorithmType[self.maze_algorithm_type().name]
+            write_maze_file(path, maze.grid, seed, algorithm, self.bits_per_cell)
+            return
+
         raise CommandError(f"Invalid filename: {output}")
 
     def setup_seed(self) -> int:
         seed = self.seed
         if seed is None:
             seed = random.randint(0, 2**64 - 1)
-        random.seed(seed)
         return seed
 
 
+def derive_seed(base_seed: int, index: int) -> int:
+    """
+    The seed of the maze at `index` in a batch, which depends only on the base
+    seed and the index.
+    """
+    digest = hashlib.blake2b(f"{base_seed}:{index}".encode(), digest_size=8)
+    return int.from_bytes(digest.digest())
+
+
 def main() -> int:
     cli = CommandLine()
     return cli.execute()
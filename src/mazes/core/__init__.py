@@ -1,2 +1,10 @@
-from .maze_state import MazeOperation, MazeState, MazeStep, MutableMazeState
+from .maze_state import (
+    MazeChanges,
+    MazeOperation,
+    MazeSnapshot,
+    MazeState,
+    MazeStep,
+    MutableMazeState,
+)
 from .maze_stepper import MazeStepper
+from .op_log import OpLog
@@ -1,3 +1,4 @@
+from array import array
 from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import assert_never
@@ -82,8 +83,38 @@ class MazeStep:
     backward_operations: list[MazeOperation] = field(default_factory=list)
 
 
+@dataclass(frozen=True, slots=True)
+class MazeSnapshot:
+    """
+    A copy of everything the operations of a `MazeStep` can change.
+    """
+
+    cells: bytes
+    distances: array
+    distances_max_coordinate: Coordinate
+    max_distance: Distance
+    max_coordinate: Coordinate | None
+    run: tuple[Coordinate, ...]
+    target_coordinates: tuple[Coordinate, ...]
+    target_directions: Direction
+
+
+@dataclass(frozen=True, slots=True)
+class MazeChanges:
+    """
+    The coordinates whose links, distance, run or target status changed.
+    """
+
+    coordinates: set[Coordinate] = field(default_factory=set)
+    # Every coordinate may have changed, e.g. the max distance the others are
+    # relative to
+    everything: bool = False
+
+
 class MazeState:
-    def __init__(self, grid: Grid, start: Coordinate) -> None:
+    def __init__(
+        self, grid: Grid, start: Coordinate, records_operations: bool = True
+    ) -> None:
         width = grid.width
         height = grid.height
 
@@ -99,7 +130,9 @@ class MazeState:
 
         self._forward_operations: list[MazeOperation] = []
         self._backward_operations: list[MazeOperation] = []
-        self._records_operations = True
+        self._records_operations = records_operations
+        self._changed_coordinates: set[Coordinate] | None = None
+        self._everything_changed = False
 
     @property
     def grid(self) -> ImmutableGrid:
@@ -138,8 +171,85 @@ class MazeState:
         return self._target_directions
 
 
+# Shared by every step of a headless state, which never records operations
+_HEADLESS_STEP = MazeStep()
+
+
 class MutableMazeState(MazeState):
+    @property
+    def records_operations(self) -> bool:
+        """
+        Whether mutations are recorded as operations. When `False`, the state
+        is "headless": mutations are applied directly and every `MazeStep` is
+        empty, so the steps cannot be undone.
+        """
+        return self._records_operations
+
+    @records_operations.setter
+    def records_operations(self, records_operations: bool) -> None:
+        self._records_operations = records_operations
+
+    @property
+    def tracks_changes(self) -> bool:
+        """
+        Whether the coordinates changed by operations are collected, for
+        `pop_changes`. Changes made while headless are not tracked.
+        """
+        return self._changed_coordinates is not None
+
+    @tracks_changes.setter
+    def tracks_changes(self, tracks_changes: bool) -> None:
+        self._changed_coordinates = set() if tracks_changes else None
+        self._everything_changed = False
+
+    def pop_changes(self) -> MazeChanges:
+        """
+        Returns what changed since the last call, or since changes started
+        being tracked.
+        """
+        changed_coordinates = self._changed_coordinates
+        if changed_coordinates is None:
+            return MazeChanges()
+        changes = MazeChanges(changed_coordinates, self._everything_changed)
+        self._changed_coordinates = set()
+        self._everything_changed = False
+        return changes
+
+    def snapshot(self) -> MazeSnapshot:
+        return MazeSnapshot(
+            bytes(self._grid.cells),
+            array("i", self._distances.values),
+            self._distances.max_coordinate,
+            self._max_distance,
+            self._max_coordinate,
+            tuple(self._run),
+            tuple(self._target_coordinates),
+            self._target_directions,
+        )
+
+    def restore(self, snapshot: MazeSnapshot) -> None:
+        """
+        Puts the state back as it was when `snapshot` was taken. Operations
+        recorded since the last `pop_maze_step` are discarded.
+        """
+        self._grid.set_cells(snapshot.cells)
+        self._distances.set_values(
+            snapshot.distances, snapshot.distances_max_coordinate
+        )
+        self._max_distance = snapshot.max_distance
+        self._max_coordinate = snapshot.max_coordinate
+        # Restored in place, as algorithms may hold on to the lists
+        self._run[:] = snapshot.run
+        self._target_coordinates[:] = snapshot.target_coordinates
+        self._target_directions = snapshot.target_directions
+        self._forward_operations = []
+        self._backward_operations = []
+        self._everything_changed = True
+
     def pop_maze_step(self) -> MazeStep:
+        if not self._records_operations:
+            return _HEADLESS_STEP
+
         forward_ops = self._forward_operations
         backward_ops = self._backward_operations
         backward_ops.reverse()
@@ -151,30 +261,55 @@ class MutableMazeState(MazeState):
         return step
 
     def push_run(self, coordinate: Coordinate) -> None:
+        if not self._records_operations:
+            self._run.append(coordinate)
+            return
         op = MazeOpPushRun(coordinate)
         self._execute_operation(op)
 
     def pop_run(self) -> None:
+        if not self._records_operations:
+            self._run.pop()
+            return
         op = MazeOpPopRun()
         self._execute_operation(op)
 
     def set_run(self, run: list[Coordinate]) -> None:
+        if not self._records_operations:
+            # Copied, as when the operation is applied
+            self._run = list(run)
+            return
         op = MazeOpSetRun(run)
         self._execute_operation(op)
 
     def grid_link(self, coordinate: Coordinate, direction: Direction) -> None:
+        if not self._records_operations:
+            self._grid.link(coordinate, direction)
+            return
         op = MazeOpGridLink(coordinate, direction)
         self._execute_operation(op)
 
     def grid_unlink(self, coordinate: Coordinate, direction: Direction) -> None:
+        if not self._records_operations:
+            self._grid.unlink(coordinate, direction)
+            return
         op = MazeOpGridUnlink(coordinate, direction)
         self._execute_operation(op)
 
     def set_target_coordinates(self, coordinates: list[Coordinate]) -> None:
+        if not self._records_operations:
+            self._target_coordinates = list(coordinates)
+            return
         op = MazeOpSetTargetCoords(coordinates)
         self._execute_operation(op)
 
     def set_distances(self, coordinate: Coordinate, distance: int) -> None:
+        if not self._records_operations:
+            self._distances[coordinate] = distance
+            if self._max_distance is None or distance > self._max_distance:
+                self._max_coordinate = coordinate
+                self._max_distance = distance
+            return
         op: MazeOperation = MazeOpSetDistance(coordinate, distance)
         self._execute_operation(op)
         if self._max_distance is None or distance > self._max_distance:
@@ -182,6 +317,9 @@ class MutableMazeState(MazeState):
             self._execute_operation(op)
 
     def apply_operation(self, operation: MazeOperation) -> MazeOperation:
+        if self._changed_coordinates is not None:
+            self._track_changes(operation, self._changed_coordinates)
+
         match operation:
             case MazeOpPushRun(val):
                 self._run.append(val)
@@ -193,8 +331,9 @@ class MutableMazeState(MazeState):
                 return MazeOpPushRun(old_head)
 
             case MazeOpSetRun(val):
+                # Copied, so that pushing onto the run does not change the op
                 prev_run = self._run
-                self._run = val
+                self._run = list(val)
                 return MazeOpSetRun(prev_run)
 
             case MazeOpGridLink(coord, dir):
@@ -206,8 +345,9 @@ class MutableMazeState(MazeState):
                 return MazeOpGridLink(coord, dir)
 
             case MazeOpSetTargetCoords(val):
+                # Copied, since restoring a snapshot changes the list in place
                 prev_targets = self._target_coordinates
-                self._target_coordinates = val
+                self._target_coordinates = list(val)
                 return MazeOpSetTargetCoords(prev_targets)
 
             case MazeOpSetTargetDirs(dirs):
@@ -233,6 +373,37 @@ class MutableMazeState(MazeState):
             case _:
                 assert_never(operation)
 
+    def _track_changes(
+        self, operation: MazeOperation, changed: set[Coordinate]
+    ) -> None:
+        """
+        Adds the coordinates `operation` is about to change to `changed`.
+        """
+        match operation:
+            case MazeOpPushRun(val):
+                # The old head becomes part of the trail
+                changed.add(val)
+                changed.update(self._run[-1:])
+            case MazeOpPopRun():
+                changed.update(self._run[-2:])
+            case MazeOpSetRun(val):
+                changed.update(self._run)
+                changed.update(val)
+            case MazeOpGridLink(coord, dir) | MazeOpGridUnlink(coord, dir):
+                changed.add(coord)
+                changed.add(dir.update_coordinate(coord))
+            case MazeOpSetTargetCoords(val):
+                changed.update(self._target_coordinates)
+                changed.update(val)
+            case MazeOpSetTargetDirs():
+                pass
+            case MazeOpSetDistance(coord, _):
+                changed.add(coord)
+            case MazeOpSetMaxDistance():
+                self._everything_changed = True
+            case _:
+                assert_never(operation)
+
     def _execute_operation(self, op: MazeOperation) -> None:
         backward_op = self.apply_operation(op)
         if self._records_operations:
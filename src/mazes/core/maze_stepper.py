@@ -1,19 +1,89 @@
-from collections import deque
-from collections.abc import Iterator
+from collections.abc import Iterable, Iterator
 
-from .maze_state import MazeOperation, MazeStep, MutableMazeState
+from .maze_state import MazeOperation, MazeSnapshot, MazeStep, MutableMazeState
+from .op_log import OpLog
+
+# The fewest steps between keyframes, for small grids
+_MIN_KEYFRAME_INTERVAL = 256
 
 
 class MazeStepper:
+    """
+    Steps a maze state forward through the steps of a generator, and back.
+    Steps are kept in a compact `OpLog`, rather than as `MazeStep` objects,
+    so the whole history can be kept for large mazes.
+
+    A keyframe of the state is taken every `keyframe_interval` steps, so
+    `seek` replays at most that many steps. By default it is a quarter of the
+    number of cells, so the keyframes take about half the memory of the log.
+    """
+
     def __init__(
-        self, state: MutableMazeState, step_generator: Iterator[MazeStep]
+        self,
+        state: MutableMazeState,
+        step_generator: Iterator[MazeStep],
+        keyframe_interval: int | None = None,
     ) -> None:
+        if keyframe_interval is None:
+            cell_count = state.grid.width * state.grid.height
+            keyframe_interval = max(_MIN_KEYFRAME_INTERVAL, cell_count // 4)
+        if keyframe_interval < 1:
+            raise ValueError(f"Invalid keyframe interval: {keyframe_interval}")
+
         self._state = state
-        self._backward_steps: deque[MazeStep] = deque()
-        self._forward_steps: deque[MazeStep] = deque()
+        self._log = OpLog(state.grid.width)
+        # The number of steps applied to the state
+        self._position = 0
+        self._keyframe_interval = keyframe_interval
+        # Keyframe `i` is the state after `i * keyframe_interval` steps
+        self._keyframes: list[MazeSnapshot] = [state.snapshot()]
         self._step_generator = step_generator
         self._generator_done = False
 
+    @property
+    def position(self) -> int:
+        return self._position
+
+    @property
+    def log(self) -> OpLog:
+        return self._log
+
+    @property
+    def keyframe_interval(self) -> int:
+        return self._keyframe_interval
+
+    def seek(self, position: int) -> int:
+        """
+        Moves to after the first `position` steps, from the current position
+        or the nearest keyframe before it, whichever is closer. Steps that
+        have not been generated yet are generated. Returns the position
+        reached, which is short of `position` if the generator ended first.
+        """
+        if position < 0:
+            raise ValueError(f"Invalid position: {position}")
+
+        target = min(position, len(self._log))
+        keyframe = target // self._keyframe_interval
+        keyframe_position = keyframe * self._keyframe_interval
+        if self._position > target:
+            if self._position - target > target - keyframe_position:
+                self._restore_keyframe(keyframe)
+            while self._position > target:
+                self.step_backward()
+        elif self._position < keyframe_position:
+            self._restore_keyframe(keyframe)
+
+        while self._position < target:
+            self._step_forward_from_saved_steps()
+        while self._position < position:
+            if not self._step_forward_from_generator():
+                break
+        return self._position
+
+    def _restore_keyframe(self, keyframe: int) -> None:
+        self._state.restore(self._keyframes[keyframe])
+        self._position = keyframe * self._keyframe_interval
+
     def step_forward_until_end(self) -> None:
         while True:
             did_step = self.step_forward()
@@ -31,34 +101,39 @@ class MazeStepper:
         Go forward one step. Returns `False` if it was unable to step,
         meaning it was at the end.
         """
-        if self._forward_steps:
+        if self._position < len(self._log):
             return self._step_forward_from_saved_steps()
         else:
             return self._step_forward_from_generator()
 
     def _step_forward_from_saved_steps(self) -> bool:
-        step = self._forward_steps.popleft()
-        self._apply_all_operations(step.forward_operations)
-        self._backward_steps.append(step)
+        self._apply_all_operations(self._log.forward_operations(self._position))
+        self._position += 1
         return True
 
     def _step_forward_from_generator(self) -> bool:
+        if self._generator_done:
+            return False
         try:
             step = next(self._step_generator)
-            self._backward_steps.append(step)
+            self._log.append(step)
+            self._position += 1
+            if self._position % self._keyframe_interval == 0:
+                self._keyframes.append(self._state.snapshot())
             return True
         except StopIteration:
+            self._generator_done = True
             return False
 
     def step_backward(self) -> bool:
-        if not self._backward_steps:
+        if self._position == 0:
             return False
 
-        step = self._backward_steps.pop()
-        self._apply_all_operations(step.backward_operations)
-        self._forward_steps.appendleft(step)
+        self._position -= 1
+        self._apply_all_operations(self._log.backward_operations(self._position))
         return True
 
-    def _apply_all_operations(self, operations: list[MazeOperation]) -> None:
+    def _apply_all_operations(self, operations: Iterable[MazeOperation]) -> None:
+        apply_operation = self._state.apply_operation
         for op in operations:
-            self._state.apply_operation(op)
+            apply_operation(op)
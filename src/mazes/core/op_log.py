@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from enum import IntEnum
+from typing import assert_never
+
+from ..distances import UNREACHED
+from ..grid import Coordinate, Direction
+from .maze_state import (
+    MazeOperation,
+    MazeOpGridLink,
+    MazeOpGridUnlink,
+    MazeOpPopRun,
+    MazeOpPushRun,
+    MazeOpSetDistance,
+    MazeOpSetMaxDistance,
+    MazeOpSetRun,
+    MazeOpSetTargetCoords,
+    MazeOpSetTargetDirs,
+    MazeStep,
+)
+
+
+class OpCode(IntEnum):
+    PushRun = 0
+    PopRun = 1
+    SetRun = 2
+    GridLink = 3
+    GridUnlink = 4
+    SetTargetCoords = 5
+    SetTargetDirs = 6
+    SetDistance = 7
+    SetMaxDistance = 8
+    ClearMaxDistance = 9
+
+
+class OpLog:
+    """
+    A compact history of `MazeStep`s. Every operation is packed into a flat
+    array of 32-bit words, as its opcode followed by its payload, where
+    coordinates are flat cell indexes. Lists of coordinates are packed as
+    their length followed by their indexes. Each step records where its
+    forward and backward operations start.
+
+    Coordinates may lie above or below the grid, but not beside it, since they
+    could not be told apart from cells of another row.
+    """
+
+    def __init__(self, width: int) -> None:
+        self._width = width
+        self._words = array("i")
+        # Step `i` has forward operations from `_offsets[2 * i]` and backward
+        # operations from `_offsets[2 * i + 1]` until `_offsets[2 * i + 2]`
+        self._offsets = array("q", [0])
+
+    def __len__(self) -> int:
+        return len(self._offsets) // 2
+
+    @property
+    def word_count(self) -> int:
+        return len(self._words)
+
+    def append(self, step: MazeStep) -> None:
+        self._encode_all(step.forward_operations)
+        self._offsets.append(len(self._words))
+        self._encode_all(step.backward_operations)
+        self._offsets.append(len(self._words))
+
+    def forward_operations(self, step: int) -> Iterator[MazeOperation]:
+        offsets = self._offsets
+        return self._decode(offsets[2 * step], offsets[2 * step + 1])
+
+    def backward_operations(self, step: int) -> Iterator[MazeOperation]:
+        offsets = self._offsets
+        return self._decode(offsets[2 * step + 1], offsets[2 * step + 2])
+
+    def step(self, step: int) -> MazeStep:
+        return MazeStep(
+            list(self.forward_operations(step)), list(self.backward_operations(step))
+        )
+
+    def _encode_all(self, operations: Iterable[MazeOperation]) -> None:
+        words = self._words
+        index_of = self._index_of
+        for operation in operations:
+            match operation:
+                case MazeOpPushRun(coordinate):
+                    words.extend((OpCode.PushRun, index_of(coordinate)))
+                case MazeOpPopRun():
+                    words.append(OpCode.PopRun)
+                case MazeOpSetRun(coordinates):
+                    words.extend((OpCode.SetRun, len(coordinates)))
+                    words.extend(map(index_of, coordinates))
+                case MazeOpGridLink(coordinate, direction):
+                    words.extend((OpCode.GridLink, index_of(coordinate), direction))
+                case MazeOpGridUnlink(coordinate, direction):
+                    words.extend((OpCode.GridUnlink, index_of(coordinate), direction))
+                case MazeOpSetTargetCoords(coordinates):
+                    words.extend((OpCode.SetTargetCoords, len(coordinates)))
+                    words.extend(map(index_of, coordinates))
+                case MazeOpSetTargetDirs(directions):
+                    words.extend((OpCode.SetTargetDirs, directions))
+                case MazeOpSetDistance(coordinate, distance):
+                    distance = UNREACHED if distance is None else distance
+                    words.extend((OpCode.SetDistance, index_of(coordinate), distance))
+                case MazeOpSetMaxDistance(None, None):
+                    words.append(OpCode.ClearMaxDistance)
+                case MazeOpSetMaxDistance(coordinate, distance):
+                    assert coordinate is not None and distance is not None
+                    words.extend(
+                        (OpCode.SetMaxDistance, index_of(coordinate), distance)
+                    )
+                case _:
+                    assert_never(operation)
+
+    def _decode(self, start: int, end: int) -> Iterator[MazeOperation]:
+        words = self._words
+        width = self._width
+        i = start
+        while i < end:
+            opcode = words[i]
+            match opcode:
+                case OpCode.PushRun:
+                    yield MazeOpPushRun(self._coordinate_of(words[i + 1]))
+                    i += 2
+                case OpCode.PopRun:
+                    yield MazeOpPopRun()
+                    i += 1
+                case OpCode.SetRun | OpCode.SetTargetCoords:
+                    count = words[i + 1]
+                    coordinates = [
+                        (index % width, index // width)
+                        for index in words[slice(i + 2, i + 2 + count)]
+                    ]
+                    if opcode == OpCode.SetRun:
+                        yield MazeOpSetRun(coordinates)
+                    else:
+                        yield MazeOpSetTargetCoords(coordinates)
+                    i += 2 + count
+                case OpCode.GridLink:
+                    coordinate = self._coordinate_of(words[i + 1])
+                    yield MazeOpGridLink(coordinate, Direction(words[i + 2]))
+                    i += 3
+                case OpCode.GridUnlink:
+                    coordinate = self._coordinate_of(words[i + 1])
+                    yield MazeOpGridUnlink(coordinate, Direction(words[i + 2]))
+                    i += 3
+                case OpCode.SetTargetDirs:
+                    yield MazeOpSetTargetDirs(Direction(words[i + 1]))
+                    i += 2
+                case OpCode.SetDistance:
+                    distance = words[i + 2]
+                    yield MazeOpSetDistance(
+                        self._coordinate_of(words[i + 1]),
+                        None if distance < 0 else distance,
+                    )
+                    i += 3
+                case OpCode.SetMaxDistance:
+                    yield MazeOpSetMaxDistance(
+                        self._coordinate_of(words[i + 1]), words[i + 2]
+                    )
+                    i += 3
+                case OpCode.ClearMaxDistance:
+                    yield MazeOpSetMaxDistance(None, None)
+                    i += 1
+                case _:
+                    raise ValueError(f"Invalid opcode {opcode} at {i}")
+
+    def _index_of(self, coordinate: Coordinate) -> int:
+        x, y = coordinate
+        if not 0 <= x < self._width:
+            raise ValueError(f"{coordinate} is beside the grid")
+        return y * self._width + x
+
+    def _coordinate_of(self, index: int) -> Coordinate:
+        y, x = divmod(index, self._width)
+        return (x, y)
@@ -1,4 +1,7 @@
-from collections.abc import Iterator
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Sequence
 
 from typing_extensions import Protocol
 
@@ -6,6 +9,9 @@ from .direction import Coordinate
 
 Distance = int | None
 
+# Stored in place of a distance for cells that have not been reached
+UNREACHED = -1
+
 
 class ImmutableDistances(Protocol):
     @property
@@ -36,6 +42,19 @@ class ImmutableDistances(Protocol):
 
     # Default implementations
 
+    @property
+    def values(self) -> memoryview:
+        """
+        The distance of every cell as 32-bit integers in row-major order, with
+        `UNREACHED` for cells that have not been reached.
+        """
+        values = array("i", [UNREACHED]) * (self.width * self.height)
+        for index, coordinate in enumerate(self.coordinates()):
+            distance = self[coordinate]
+            if distance is not None:
+                values[index] = distance
+        return memoryview(values).toreadonly()
+
     def is_valid_coordinate(self, coordinate: Coordinate) -> bool:
         x, y = coordinate
         if x not in range(self.width):
@@ -50,6 +69,11 @@ class ImmutableDistances(Protocol):
 
 
 class Distances(ImmutableDistances):
+    """
+    Distances stored as one 32-bit integer per cell in a flat, row-major
+    `array`, with `UNREACHED` for cells that have not been reached.
+    """
+
     def __init__(self, width: int, height: int, root: Coordinate) -> None:
         self._width = width
         self._height = height
@@ -58,10 +82,32 @@ class Distances(ImmutableDistances):
         self._max_coordinate = root
         self._max_distance = 0
 
-    def _prepare_grid(self) -> list[list[Distance]]:
-        row: list[Distance] = [None] * self._width
-        grid = [row.copy() for _ in range(self._height)]
-        return grid
+    @classmethod
+    def from_flat(
+        cls,
+        width: int,
+        height: int,
+        root: Coordinate,
+        values: Sequence[int],
+        max_coordinate: Coordinate,
+    ) -> Distances:
+        """
+        Creates distances from `values` in row-major order, where negative
+        values are cells that were not reached. An `array("i")` is used as is,
+        without copying.
+        """
+        distances = cls(width, height, root)
+        if not (isinstance(values, array) and values.typecode == "i"):
+            values = array("i", values)
+        if len(values) != width * height:
+            raise ValueError(f"Expected {width * height} values, got {len(values)}")
+        distances._grid = values
+        distances._max_coordinate = max_coordinate
+        distances._max_distance = distances[max_coordinate] or 0
+        return distances
+
+    def _prepare_grid(self) -> array:
+        return array("i", [UNREACHED]) * (self._width * self._height)
 
     @property
     def width(self) -> int:
@@ -83,26 +129,47 @@ class Distances(ImmutableDistances):
     def max_distance(self) -> int:
         return self._max_distance
 
+    @property
+    def values(self) -> memoryview:
+        """
+        A read-only view of the distance of every cell as 32-bit integers in
+        row-major order, with `UNREACHED` for cells that have not been
+        reached. This does not copy, so it can be wrapped by other array
+        libraries, e.g. `numpy.frombuffer(distances.values, numpy.int32)`.
+        """
+        return memoryview(self._grid).toreadonly()
+
     def __getitem__(self, coordinate: Coordinate) -> Distance:
         self.assert_valid_coordinate(coordinate)
 
         x, y = coordinate
-        return self._grid[y][x]
+        distance = self._grid[y * self._width + x]
+        return None if distance < 0 else distance
 
     def __setitem__(self, coordinate: Coordinate, distance: int) -> None:
         self.assert_valid_coordinate(coordinate)
 
         x, y = coordinate
-        self._grid[y][x] = distance
+        self._grid[y * self._width + x] = distance
         if distance > self._max_distance:
             self._max_distance = distance
             self._max_coordinate = coordinate
 
+    def set_values(self, values: Sequence[int], max_coordinate: Coordinate) -> None:
+        """
+        Replaces the distance of every cell, given in row-major order.
+        """
+        if len(values) != len(self._grid):
+            raise ValueError(f"Expected {len(self._grid)} values, got {len(values)}")
+        self._grid[:] = array("i", values)
+        self._max_coordinate = max_coordinate
+        self._max_distance = self[max_coordinate] or 0
+
     def clear_at(self, coordinate: Coordinate) -> None:
         self.assert_valid_coordinate(coordinate)
 
         x, y = coordinate
-        self._grid[y][x] = None
+        self._grid[y * self._width + x] = UNREACHED
 
     def coordinates(self) -> Iterator[Coordinate]:
         for y in range(self._height):
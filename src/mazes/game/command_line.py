@@ -3,6 +3,7 @@ import logging
 import sys
 
 from .game_loop import GameLoop
+from .step_budget import DEFAULT_STEP_BUDGET_MS
 
 
 class CommandError(Exception):
@@ -12,6 +13,7 @@ class CommandError(Exception):
 class CommandLine:
     def __init__(self) -> None:
         self._log_option: str | None = None
+        self._step_budget_ms = DEFAULT_STEP_BUDGET_MS
 
     def execute(self) -> int:
         try:
@@ -33,14 +35,22 @@ class CommandLine:
             default="warning",
             help="Set log level",
         )
+        parser.add_argument(
+            "--step-budget",
+            type=non_negative_float,
+            default=DEFAULT_STEP_BUDGET_MS,
+            metavar="MS",
+            help="Most milliseconds spent stepping the maze per frame",
+        )
 
         args = parser.parse_args()
 
         self._log_option = args.log
+        self._step_budget_ms = args.step_budget
 
     def run(self) -> None:
         logging.basicConfig(level=self.log_level)
-        game_loop = GameLoop()
+        game_loop = GameLoop(self._step_budget_ms)
         game_loop.execute()
 
     @property
@@ -59,6 +69,13 @@ class CommandLine:
                 return logging.WARNING
 
 
+def non_negative_float(value: str) -> float:
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"must not be negative: {value}")
+    return number
+
+
 def main() -> int:
     cli = CommandLine()
     return cli.execute()
@@ -1,10 +1,12 @@
 import logging
+import time
 from dataclasses import dataclass
 
 import pygame as pg
 
 from . import utils
 from .game_maze import GameMaze
+from .step_budget import DEFAULT_STEP_BUDGET_MS
 
 
 class ButtonInput:
@@ -76,11 +78,40 @@ class JoystickState:
     lstick_vertical: float = 0.0
 
 
-class GameLoop:
+class FrameStats:
+    """
+    How long frames took to update and draw, not counting the wait for the
+    next frame, since the last reset.
+    """
+
     def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.frames = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        return self.seconds / self.frames * 1000 if self.frames else 0.0
+
+    @property
+    def max_ms(self) -> float:
+        return self.max_seconds * 1000
+
+    def add_frame(self, seconds: float) -> None:
+        self.frames += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+
+class GameLoop:
+    def __init__(self, step_budget_ms: float = DEFAULT_STEP_BUDGET_MS) -> None:
         self._running = True
         self.width = 800
         self.height = 600
+        self.step_budget_ms = step_budget_ms
         self.logger = logging.getLogger(__name__)
 
     def execute(self) -> int:
@@ -99,27 +130,38 @@ class GameLoop:
 
         # Main loop
         frame = 0
+        self._stats_start = time.perf_counter()
         while self._running:
+            frame_start = time.perf_counter()
             self.update()
 
             self.draw()
             pg.display.flip()
+            self._frame_stats.add_frame(time.perf_counter() - frame_start)
 
             clock.tick(FPS)
             frame += 1
             frame = frame % FPS
             if frame == 0:
-                fps = clock.get_fps()
-                self.logger.debug("FPS: %f", fps)
+                self.update_stats(clock.get_fps())
 
         pg.quit()
         return 0
 
     def init(self) -> None:
         self._player = pg.Rect((300, 250, 50, 50))
-        self._maze = GameMaze(24 * 3 // 2, 18 * 3 // 2, self.width, self.height, 20, 20)
+        self._maze = GameMaze(
+            24 * 3 // 2,
+            18 * 3 // 2,
+            self.width,
+            self.height,
+            20,
+            20,
+            self.step_budget_ms,
+        )
         self._reset_key = ButtonInput()
         self._quit_key = ButtonInput()
+        self._stats_key = ButtonInput()
         self._jump_key = ButtonInput()
         self._next_key = RepeatingButtonInput()
         self._prev_key = RepeatingButtonInput()
@@ -132,6 +174,12 @@ class GameLoop:
         self._joysticks: dict[int, pg.joystick.JoystickType] = {}
         self._max_analog_speed = 100.0 ** (1.0 / 4)
 
+        self._frame_stats = FrameStats()
+        self._stats_start = time.perf_counter()
+        self._show_stats = False
+        self._stats_font = pg.font.Font(None, 20)
+        self._stats_text: pg.Surface | None = None
+
     def update(self) -> None:
         joystick_state = self._joystick_state
 
@@ -194,6 +242,7 @@ class GameLoop:
         self._jump_key.update(keys[pg.K_RETURN])
         self._jump_button.update(joystick_state.a_button)
         self._quit_key.update(keys[pg.K_q])
+        self._stats_key.update(keys[pg.K_TAB])
         self._next_key.update(keys[pg.K_f] or keys[pg.K_RIGHT])
         self._next_button.update(joystick_state.r_button)
         self._prev_key.update(keys[pg.K_s] or keys[pg.K_LEFT])
@@ -216,6 +265,8 @@ class GameLoop:
             self._maze.single_step_backward()
         if self._quit_key:
             self._running = False
+        if self._stats_key:
+            self._show_stats = not self._show_stats
 
     def update_analog_speed(self, lstick_horizontal: float) -> None:
         dir = utils.fsign(lstick_horizontal)
@@ -227,8 +278,26 @@ class GameLoop:
         analog_speed = dir * scaled
         self._maze.generation_velocity = analog_speed
 
-    def draw(self) -> None:
-        screen = self._screen
-        screen.fill((238, 232, 213))
+    def update_stats(self, fps: float) -> None:
+        """
+        Logs and renders the frame and step timings since the last update.
+        """
+        now = time.perf_counter()
+        elapsed = now - self._stats_start
+        self._stats_start = now
+        steps, step_seconds = self._maze.pop_step_stats()
+        frame_stats = self._frame_stats
+        stats = (
+            f"{fps:.0f} FPS, frame {frame_stats.average_ms:.1f} ms"
+            f" (max {frame_stats.max_ms:.1f} ms),"
+            f" {steps / elapsed:,.0f} steps/s"
+            f" ({step_seconds / steps * 1e6 if steps else 0:.1f} us/step)"
+        )
+        frame_stats.reset()
+        self.logger.debug("Stats: %s", stats)
+        self._stats_text = self._stats_font.render(stats, True, (0, 0, 0))
 
-        self._maze.draw(screen)
+    def draw(self) -> None:
+        self._maze.draw(self._screen)
+        if self._show_stats and self._stats_text is not None:
+            self._screen.blit(self._stats_text, (4, 4))
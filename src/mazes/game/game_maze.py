@@ -1,5 +1,8 @@
 import logging
 import math
+import threading
+import time
+from collections.abc import Iterable, Iterator
 from enum import Enum, auto
 
 import pygame as pg
@@ -16,6 +19,18 @@ from mazes import (
 from mazes.algorithms import Dijkstra
 
 from .color_gradient import Color, ColorGradient
+from .generation_worker import STEPS_PER_YIELD, GenerationWorker
+from .step_budget import DEFAULT_STEP_BUDGET_MS, StepBudget
+from .wall_tiles import WallTiles
+
+BACKGROUND_COLOR: Color = (238, 232, 213)
+_EMPTY_COLOR: Color = (147, 161, 161)
+# Never drawn, so it marks the transparent cells of a layer
+_TRANSPARENT: Color = (255, 0, 255)
+
+_BACKGROUND_RGB = bytes(BACKGROUND_COLOR)
+_EMPTY_COLOR_RGB = bytes(_EMPTY_COLOR)
+_TRANSPARENT_RGB = bytes(_TRANSPARENT)
 
 
 class GameMaze:
@@ -32,6 +47,7 @@ class GameMaze:
         screen_height: int,
         padding_x: int,
         padding_y: int,
+        step_budget_ms: float = DEFAULT_STEP_BUDGET_MS,
     ) -> None:
         self.logger = logging.getLogger(__name__)
         self._grid_width = grid_width
@@ -50,9 +66,16 @@ class GameMaze:
         actual_height = self._cell_height * grid_height
         self._padding_y = math.floor((screen_height - actual_height) / 2)
 
+        self._wall_tiles = WallTiles(self._cell_width, self._cell_height)
         self._distance_gradient = ColorGradient((253, 246, 227), (38, 139, 210), 256)
         self._path_gradient = ColorGradient((220, 50, 47), (133, 153, 0), 256)
 
+        self._step_budget = StepBudget(step_budget_ms)
+
+        self._worker: GenerationWorker | None = None
+        # Steps to the end of a stage while frames keep being drawn
+        self._jump: threading.Thread | None = None
+        self._jump_cancelled = threading.Event()
         self.reset()
 
     def reset(self) -> None:
@@ -71,15 +94,30 @@ class GameMaze:
         # options.end = options.northwest_corner
 
         logging.info("options: %s", options)
+        self._jump_cancelled.set()
+        if self._worker is not None:
+            self._worker.stop()
+        self._jump = None
         self._maze = MazeGenerator(options)
         print(f"Seed: {self._maze.seed}")
-        self._maze_stepper = self._maze.make_stepper()
+        # The steps are generated in the background, from the same seed
+        options.seed = self._maze.seed
+        self._worker = GenerationWorker(options)
+        state = self._maze.mutable_state
+        self._maze_stepper = MazeStepper(state, self._worker.steps(state))
+        state.tracks_changes = True
+        # The maze as last drawn, where only changed cells are redrawn
+        self._canvas = pg.Surface((self._screen_width, self._screen_height))
+        self._needs_full_redraw = True
+        # Cells drawn in a pulsing color, which changes every frame
+        self._pulsing: set[Coordinate] = set()
         self._state = self.State.Generating
         self._generation_speed = 0
         self._generation_speed_sign = 1
         self._generation_timer = 0
         self._generation_timer_steps = 0
         self._generation_timer_multiplier = 3
+        self._step_budget.drop_carried_steps()
         self._dijkstra: Dijkstra | None = None
         self._path_distances: Distances | None = None
         self._pulse_gradient = ColorGradient((220, 50, 47), (235, 136, 134), 256)
@@ -93,17 +131,18 @@ class GameMaze:
 
     @generation_velocity.setter
     def generation_velocity(self, velocity: int) -> None:
-        if velocity >= 0:
-            self._generation_speed = velocity
-            self._generation_speed_sign = 1
-        else:
-            self._generation_speed = velocity * -1
-            self._generation_speed_sign = -1
+        sign = 1 if velocity >= 0 else -1
+        if sign != self._generation_speed_sign:
+            # Steps carried over were requested in the other direction
+            self._step_budget.drop_carried_steps()
+        self._generation_speed = velocity * sign
+        self._generation_speed_sign = sign
 
     def clear_cursors(self) -> None:
         self._current: set[Coordinate] = set()
         self._trail: set[Coordinate] = set()
         self._targets: set[Coordinate] = set()
+        self._needs_full_redraw = True
 
     def update_cursors(self) -> None:
         run = self._maze.state.run
@@ -115,13 +154,21 @@ class GameMaze:
             self._trail = set()
         self._targets = set(self._maze.state.target_coordinates)
 
+    @property
+    def is_jumping(self) -> bool:
+        return self._jump is not None
+
     def single_step_forward(self) -> None:
+        if self.is_jumping:
+            return
         if self._state is self.State.Generating:
             self.single_step_generating()
         if self._state is self.State.Dijkstra:
             self.single_step_dijkstra()
 
     def single_step_generating(self) -> None:
+        if not self.can_step_forward(self._maze_stepper):
+            return
         self._pulse_tick = 0
         did_step = self._maze_stepper.step_forward()
         self.update_cursors()
@@ -140,6 +187,8 @@ class GameMaze:
             self.setup_done()
 
     def single_step_backward(self) -> None:
+        if self.is_jumping:
+            return
         if self._state is self.State.Generating:
             self.single_step_backward_generating()
         if self._state is self.State.Dijkstra:
@@ -159,6 +208,9 @@ class GameMaze:
         self.logger.debug("Dijkstra did_step backward: %r", did_step)
 
     def update(self) -> None:
+        if self._jump is not None:
+            self.update_jump()
+            return
         self.update_generation_timer()
         if self._state is self.State.Generating:
             self.update_generating()
@@ -173,8 +225,9 @@ class GameMaze:
         self._generation_timer += (
             self._generation_speed * self._generation_timer_multiplier
         )
-        self._generation_timer_steps = self._generation_timer // 100
+        requested_steps = self._generation_timer // 100
         self._generation_timer %= 100
+        self._generation_timer_steps = self._step_budget.steps_for(requested_steps)
 
     def update_generating(self) -> None:
         did_step = True
@@ -191,6 +244,7 @@ class GameMaze:
 
     def setup_dijkstra(self) -> None:
         self.clear_cursors()
+        self._step_budget.drop_carried_steps()
         self._generation_timer_multiplier = 1
         self._dijkstra = Dijkstra(
             self._maze.grid, self._maze.start, self._maze.mutable_state
@@ -215,85 +269,258 @@ class GameMaze:
             self.setup_done()
 
     def update_stepper_forward(self, stepper: MazeStepper) -> bool:
-        did_step = True
-        for _ in range(self._generation_timer_steps):
-            did_step = stepper.step_forward()
-            if not did_step:
-                break
-        return did_step
+        return self._step_budget.take_steps(
+            self._generation_timer_steps,
+            stepper.step_forward,
+            lambda: self.can_step_forward(stepper),
+        )
+
+    def can_step_forward(self, stepper: MazeStepper) -> bool:
+        """
+        Whether `stepper` can step forward without waiting for the generation
+        worker to catch up.
+        """
+        if stepper is not self._maze_stepper or self._worker is None:
+            return True
+        return stepper.position < len(stepper.log) or self._worker.is_ready
 
     def update_stepper_backward(self, stepper: MazeStepper) -> bool:
-        for _ in range(self._generation_timer_steps):
-            did_step = stepper.step_backward()
-            if not did_step:
-                break
+        self._step_budget.take_steps(
+            self._generation_timer_steps, stepper.step_backward
+        )
         return True
 
+    def pop_step_stats(self) -> tuple[int, float]:
+        """
+        Returns the number of steps taken since the last call, and the seconds
+        spent taking them.
+        """
+        return self._step_budget.pop_stats()
+
     def setup_done(self) -> None:
         assert self._dijkstra is not None
+        self._step_budget.drop_carried_steps()
         self.logger.info("Start %r -> End: %r", self._maze.start, self._maze.end)
         goal = self._maze.end
         self._path_distances = self._dijkstra.path_to(goal)
         self._state = self.State.Done
+        self._needs_full_redraw = True
 
     def run_to_completion(self) -> None:
+        """
+        Steps to the end of the current stage on a background thread, which
+        `update` waits for without holding up frames.
+        """
+        if self._jump is not None:
+            return
+        if self._state is self.State.Generating:
+            stepper = self._maze_stepper
+        elif self._state is self.State.Dijkstra:
+            stepper = self._dijkstra_stepper
+        else:
+            return
+        self._jump_cancelled = threading.Event()
+        self._jump = threading.Thread(
+            target=self.step_to_end,
+            args=(stepper, self._jump_cancelled),
+            name="maze-jump",
+            daemon=True,
+        )
+        self._jump.start()
+
+    @staticmethod
+    def step_to_end(stepper: MazeStepper, cancelled: threading.Event) -> None:
+        count = 0
+        while stepper.step_forward():
+            count += 1
+            if count % STEPS_PER_YIELD == 0:
+                if cancelled.is_set():
+                    return
+                time.sleep(0)
+
+    def update_jump(self) -> None:
+        assert self._jump is not None
+        if self._jump.is_alive():
+            return
+        self._jump = None
+        self._needs_full_redraw = True
         if self._state is self.State.Generating:
-            self._maze_stepper.step_forward_until_end()
+            self.logger.info("Maze done!")
             self.setup_dijkstra()
         elif self._state is self.State.Dijkstra:
-            self._dijkstra_stepper.step_forward_until_end()
+            self.logger.info("Dijkstra done!")
             self.setup_done()
 
     def draw(self, surface: pg.Surface) -> None:
-        start_x, start_y = (self._padding_x, self._padding_y)
-        x, y = (start_x, start_y)
-        fg = (0, 0, 0)
-        line_width = 3
-        line_offset = line_width // 2
+        """
+        Draws the maze over the whole of `surface`. Only the cells that changed
+        since the last frame are redrawn onto the canvas it is copied from.
+        """
+        canvas = self._canvas
+        if self._jump is not None:
+            # The state is being stepped on another thread
+            surface.blit(canvas, (0, 0))
+            return
+        grid = self._maze.grid
+        changes = self._maze.mutable_state.pop_changes()
+        pulsing = self._pulsing
+        self._pulsing = set()
+        if self._needs_full_redraw or changes.everything:
+            self._needs_full_redraw = False
+            canvas.fill(BACKGROUND_COLOR)
+            self.draw_all_backgrounds(canvas)
+            self.draw_walls(canvas, grid.coordinates())
+        else:
+            changed = [
+                coord
+                for coord in changes.coordinates | pulsing
+                if grid.is_valid_coordinate(coord)
+            ]
+            self.draw_backgrounds(canvas, changed)
+            # The walls of the neighbors overlap the cells
+            neighbors = {
+                (x, y)
+                for grid_x, grid_y in changed
+                for y in range(grid_y - 1, grid_y + 2)
+                for x in range(grid_x - 1, grid_x + 2)
+            }
+            self.draw_walls(canvas, filter(grid.is_valid_coordinate, neighbors))
+        surface.blit(canvas, (0, 0))
+
+    def draw_all_backgrounds(self, surface: pg.Surface) -> None:
+        """
+        Draws the background of every cell at once, with the same colors as
+        `background_color_of`. The colors are laid out in layers with one
+        pixel per cell, which are then scaled up to the cell size.
+        """
+        state = self._maze.state
+        size = (self._grid_width, self._grid_height)
+        links_colors = [_EMPTY_COLOR_RGB] + [_BACKGROUND_RGB] * Direction.All
+        # The image is drawn into and shares its buffer, so the buffer must not
+        # be a joined bytes object: one cell would join to a color constant
+        cells = state.grid.cells
+        cells_image = bytearray().join(map(links_colors.__getitem__, cells))
+        image = pg.image.frombuffer(cells_image, size, "RGB")
+
+        max_distance = state.max_distance
+        if max_distance is not None:
+            distances = state.distances.values
+            colors = self.distance_colors(self._distance_gradient, max_distance)
+            colors[max_distance] = bytes(self.pulse_color())
+            self._blit_layer(image, map(colors.__getitem__, distances))
+            self._pulsing.update(self.coordinates_at_distance(max_distance))
+
+        path = self._path_distances
+        if path is not None:
+            colors = self.distance_colors(self._path_gradient, path.max_distance)
+            self._blit_layer(image, map(colors.__getitem__, path.values))
+
+        # Cursors are few, so they are set one at a time
+        grid = state.grid
+        for coordinates, color in [
+            (self._targets, (181, 137, 0)),
+            (self._trail, (211, 54, 130)),
+        ]:
+            for coord in coordinates:
+                if grid.is_valid_coordinate(coord):
+                    image.set_at(coord, color)
+        for coord in self._current:
+            image.set_at(coord, self.pulse_color_of(coord))
+
+        scaled_size = (
+            self._grid_width * self._cell_width,
+            self._grid_height * self._cell_height,
+        )
+        surface.blit(
+            pg.transform.scale(image, scaled_size), (self._padding_x, self._padding_y)
+        )
 
+    def _blit_layer(self, image: pg.Surface, colors: Iterable[bytes]) -> None:
+        layer = pg.image.frombuffer(b"".join(colors), image.get_size(), "RGB")
+        layer.set_colorkey(_TRANSPARENT)
+        image.blit(layer, (0, 0))
+
+    def distance_colors(
+        self, gradient: ColorGradient, max_distance: int
+    ) -> list[bytes]:
+        """
+        The color of every distance up to `max_distance` as RGB bytes, then a
+        transparent color last, so that the list can be indexed by distance
+        values, including `UNREACHED`.
+        """
+        divisor = max(max_distance, 1)
+        colors = [
+            bytes(gradient.interpolate(distance * 255 // divisor))
+            for distance in range(max_distance + 1)
+        ]
+        colors.append(_TRANSPARENT_RGB)
+        return colors
+
+    def coordinates_at_distance(self, distance: int) -> Iterator[Coordinate]:
+        values = self._maze.state.distances.values.tolist()
+        width = self._grid_width
+        index = -1
+        while True:
+            try:
+                index = values.index(distance, index + 1)
+            except ValueError:
+                return
+            yield (index % width, index // width)
+
+    def draw_backgrounds(
+        self, surface: pg.Surface, coordinates: Iterable[Coordinate]
+    ) -> None:
+        """
+        Fills the cells at `coordinates` with their background colors.
+        """
+        start_x, start_y = (self._padding_x, self._padding_y)
         cell_width = self._cell_width
         cell_height = self._cell_height
         grid = self._maze.grid
-        for grid_y in range(self._grid_height):
-            for grid_x in range(self._grid_width):
-                coord = (grid_x, grid_y)
-                dir = grid[coord]
-                assert dir is not None
-
-                rect = pg.Rect(x, y, cell_width, cell_height)
-                rect_color = self.background_color_of(coord, dir)
-                if rect_color is not None:
-                    pg.draw.rect(surface, rect_color, rect)
-
-                if Direction.N not in dir:
-                    # Horizontal line
-                    pg.draw.line(
-                        surface,
-                        fg,
-                        (x - line_offset, y),
-                        (x + cell_width + line_offset, y),
-                        line_width,
-                    )
-                else:
-                    pg.draw.line(
-                        surface,
-                        fg,
-                        (x - line_offset, y),
-                        (x + line_offset, y),
-                        line_width,
-                    )
-                if Direction.W not in dir:
-                    # Vertical line
-                    pg.draw.line(
-                        surface,
-                        fg,
-                        (x, y - line_offset),
-                        (x, y + cell_height + line_offset),
-                        line_width,
-                    )
-                x += cell_width
-            x = start_x
-            y += cell_height
+        for coord in coordinates:
+            dir = grid[coord]
+            assert dir is not None
+            rect_color = self.background_color_of(coord, dir) or BACKGROUND_COLOR
+            grid_x, grid_y = coord
+            surface.fill(
+                rect_color,
+                (
+                    start_x + grid_x * cell_width,
+                    start_y + grid_y * cell_height,
+                    cell_width,
+                    cell_height,
+                ),
+            )
+
+    def draw_walls(
+        self, surface: pg.Surface, coordinates: Iterable[Coordinate]
+    ) -> None:
+        """
+        Draws the walls of the cells at `coordinates` in a single batch, then
+        the right and bottom edges.
+        """
+        start_x = self._padding_x + self._wall_tiles.offset
+        start_y = self._padding_y + self._wall_tiles.offset
+        cell_width = self._cell_width
+        cell_height = self._cell_height
+        cells = self._maze.grid.cells
+        width = self._grid_width
+        tiles = self._wall_tiles
+        surface.blits(
+            [
+                (
+                    tiles[cells[grid_y * width + grid_x]],
+                    (start_x + grid_x * cell_width, start_y + grid_y * cell_height),
+                )
+                for grid_x, grid_y in coordinates
+            ],
+            doreturn=False,
+        )
+
+        fg = (0, 0, 0)
+        line_width = 3
+        line_offset = line_width // 2
+        start_x, start_y = (self._padding_x, self._padding_y)
         end_x = start_x + self._grid_width * cell_width
         end_y = start_y + self._grid_height * cell_height
 
@@ -325,16 +552,13 @@ class GameMaze:
         if color is not None:
             return color
         if dir is Direction.Empty:
-            return (147, 161, 161)
+            return _EMPTY_COLOR
 
         return None
 
     def background_color_of_cursor(self, coord: Coordinate) -> Color | None:
         if coord in self._current:
-            val = self._pulse_tick % 512
-            if val > 255:
-                val = 255 - (val - 256)
-            return self._pulse_gradient.interpolate(val)
+            return self.pulse_color_of(coord)
         elif coord in self._trail:
             return (211, 54, 130)
         elif coord in self._targets:
@@ -368,13 +592,20 @@ class GameMaze:
 
         color: Color
         if distance == max_distance:
-            val = self._pulse_tick % 512
-            if val > 255:
-                val = 255 - (val - 256)
-            color = self._pulse_gradient.interpolate(val)
+            color = self.pulse_color_of(coord)
         else:
             # inline remap
             intensity = (distance * 255) // max_distance
             color = self._distance_gradient.interpolate(intensity)
 
         return color
+
+    def pulse_color_of(self, coord: Coordinate) -> Color:
+        self._pulsing.add(coord)
+        return self.pulse_color()
+
+    def pulse_color(self) -> Color:
+        val = self._pulse_tick % 512
+        if val > 255:
+            val = 255 - (val - 256)
+        return self._pulse_gradient.interpolate(val)
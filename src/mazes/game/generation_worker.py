@@ -0,0 +1,90 @@
+import queue
+import threading
+import time
+from collections.abc import Iterator
+
+from mazes import MazeGenerator, MazeOptions, MazeStep, MutableMazeState
+
+# How long to wait on the queue before checking whether the worker stopped
+_POLL_SECONDS = 0.1
+# Steps between letting other threads run, so that frames are not held up
+# waiting for the GIL
+STEPS_PER_YIELD = 64
+
+
+class GenerationWorker:
+    """
+    Generates a maze on a background thread, into a state of its own, and
+    queues its steps for `steps` to apply to another state. At most
+    `max_queued` steps are generated ahead of the steps taken.
+    """
+
+    def __init__(self, options: MazeOptions, max_queued: int = 4096) -> None:
+        self._generator = MazeGenerator(options)
+        self._queue: queue.Queue[MazeStep | None] = queue.Queue(max_queued)
+        self._stopped = threading.Event()
+        self._finished = False
+        self._error: BaseException | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="maze-generation", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def seed(self) -> int:
+        return self._generator.seed
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        Whether the next step of `steps`, or its end, is ready without waiting.
+        """
+        return self._finished or self._stopped.is_set() or not self._queue.empty()
+
+    def steps(self, state: MutableMazeState) -> Iterator[MazeStep]:
+        """
+        Yields the generated steps after applying them to `state`, which must
+        start as the worker's own state did, i.e. from the same options and
+        seed. Waits for the worker when no steps are queued, and ends as soon
+        as it is stopped.
+        """
+        while not self._stopped.is_set():
+            try:
+                step = self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if step is None:
+                self._finished = True
+                if self._error is not None:
+                    raise self._error
+                return
+            for operation in step.forward_operations:
+                state.apply_operation(operation)
+            yield step
+
+    def stop(self) -> None:
+        """
+        Stops the worker without waiting for its thread, which ends by itself
+        within `_POLL_SECONDS` of being blocked on a full queue.
+        """
+        self._stopped.set()
+
+    def _run(self) -> None:
+        try:
+            for count, step in enumerate(self._generator.maze_steps(), 1):
+                if not self._put(step):
+                    return
+                if count % STEPS_PER_YIELD == 0:
+                    time.sleep(0)
+        except BaseException as e:
+            self._error = e
+        self._put(None)
+
+    def _put(self, step: MazeStep | None) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(step, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
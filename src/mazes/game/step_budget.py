@@ -0,0 +1,73 @@
+import time
+from collections.abc import Callable
+
+# Most milliseconds spent stepping the maze per frame
+DEFAULT_STEP_BUDGET_MS = 8.0
+
+
+class StepBudget:
+    """
+    Limits the steps taken each frame to those that fit in `budget_ms`. Steps
+    that do not fit are carried over to the next frame, up to a frame's worth.
+    """
+
+    def __init__(self, budget_ms: float = DEFAULT_STEP_BUDGET_MS) -> None:
+        self.budget_ms = budget_ms
+        self._carried_steps = 0
+        self._steps_taken = 0
+        self._step_seconds = 0.0
+
+    @property
+    def carried_steps(self) -> int:
+        return self._carried_steps
+
+    def steps_for(self, requested_steps: int) -> int:
+        """
+        The steps to take this frame: those requested, plus up to as many
+        carried over from the last frame.
+        """
+        return requested_steps + min(self._carried_steps, requested_steps)
+
+    def drop_carried_steps(self) -> None:
+        """
+        Forgets the steps carried over, which only apply to the direction and
+        stage they were requested for.
+        """
+        self._carried_steps = 0
+
+    def take_steps(
+        self,
+        steps: int,
+        step: Callable[[], bool],
+        can_step: Callable[[], bool] = lambda: True,
+    ) -> bool:
+        """
+        Takes up to `steps` steps, stopping early once `budget_ms` is spent or
+        `can_step` is false, and carries the rest over. Returns `False` if
+        `step` was unable to step.
+        """
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        taken = 0
+        did_step = True
+        while taken < steps and can_step():
+            did_step = step()
+            if not did_step:
+                break
+            taken += 1
+            if time.perf_counter() >= deadline:
+                break
+        self._carried_steps = steps - taken if did_step else 0
+        self._steps_taken += taken
+        self._step_seconds += time.perf_counter() - start
+        return did_step
+
+    def pop_stats(self) -> tuple[int, float]:
+        """
+        Returns the number of steps taken since the last call, and the seconds
+        spent taking them.
+        """
+        stats = (self._steps_taken, self._step_seconds)
+        self._steps_taken = 0
+        self._step_seconds = 0.0
+        return stats
@@ -0,0 +1,87 @@
+import pygame as pg
+
+from mazes import Direction
+
+from .color_gradient import Color
+
+# Never drawn, so it marks the transparent parts of a tile
+_TRANSPARENT: Color = (255, 0, 255)
+
+
+class WallTiles:
+    """
+    The walls of a cell pre-rendered for every set of links, so that the walls
+    of a whole grid can be drawn with a single `Surface.blits`.
+
+    Each cell draws its north and west walls, which overlap its neighbors by
+    half the line width, so tiles are larger than a cell and are blitted at
+    `offset` from its corner.
+    """
+
+    def __init__(
+        self,
+        cell_width: int,
+        cell_height: int,
+        color: Color = (0, 0, 0),
+        line_width: int = 3,
+    ) -> None:
+        self._cell_width = cell_width
+        self._cell_height = cell_height
+        self._color = color
+        self._line_width = line_width
+        self._line_offset = line_width // 2
+
+        # Only the north and west walls are drawn, so tiles are shared
+        walls_tiles: dict[Direction, pg.Surface] = {}
+        self._tiles: list[pg.Surface] = []
+        for links in range(Direction.All + 1):
+            walls = Direction(links) & (Direction.N | Direction.W)
+            if walls not in walls_tiles:
+                walls_tiles[walls] = self._render(walls)
+            self._tiles.append(walls_tiles[walls])
+
+    @property
+    def offset(self) -> int:
+        return -self._line_offset
+
+    def __getitem__(self, links: int) -> pg.Surface:
+        return self._tiles[links]
+
+    def _render(self, links: Direction) -> pg.Surface:
+        cell_width = self._cell_width
+        cell_height = self._cell_height
+        line_width = self._line_width
+        line_offset = self._line_offset
+        tile = pg.Surface((cell_width + line_width, cell_height + line_width))
+        tile.fill(_TRANSPARENT)
+        tile.set_colorkey(_TRANSPARENT, pg.RLEACCEL)
+
+        # The cell's corner within the tile
+        x, y = (line_offset, line_offset)
+        if Direction.N not in links:
+            # Horizontal line
+            pg.draw.line(
+                tile,
+                self._color,
+                (x - line_offset, y),
+                (x + cell_width + line_offset, y),
+                line_width,
+            )
+        else:
+            pg.draw.line(
+                tile,
+                self._color,
+                (x - line_offset, y),
+                (x + line_offset, y),
+                line_width,
+            )
+        if Direction.W not in links:
+            # Vertical line
+            pg.draw.line(
+                tile,
+                self._color,
+                (x, y - line_offset),
+                (x, y + cell_height + line_offset),
+                line_width,
+            )
+        return tile
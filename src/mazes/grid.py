@@ -4,6 +4,9 @@ from typing_extensions import Protocol
 
 from .direction import Coordinate, Direction
 
+# Every possible combination of links, indexed by its integer value
+DIRECTIONS = tuple(Direction(bits) for bits in range(Direction.All + 1))
+
 
 class ImmutableGrid(Protocol):
     # Abstract methods
@@ -22,6 +25,13 @@ class ImmutableGrid(Protocol):
     def __iter__(self) -> Iterator[tuple[Coordinate, Direction]]:
         ...
 
+    @property
+    def cells(self) -> memoryview:
+        """
+        The links of every cell, in row-major order.
+        """
+        return memoryview(bytes(links for _, links in self))
+
     def coordinates(self) -> Iterator[Coordinate]:
         for y in range(self.height):
             for x in range(self.width):
@@ -42,6 +52,14 @@ class ImmutableGrid(Protocol):
             return False
         return True
 
+    def index_of(self, coordinate: Coordinate) -> int:
+        x, y = coordinate
+        return y * self.width + x
+
+    def coordinate_of(self, index: int) -> Coordinate:
+        y, x = divmod(index, self.width)
+        return (x, y)
+
     def valid_directions(self, coordinate: Coordinate) -> Direction:
         x, y = coordinate
         valid_directions = Direction.Empty
@@ -92,15 +110,18 @@ class ImmutableGrid(Protocol):
 
 
 class Grid(ImmutableGrid):
+    """
+    A mutable grid that stores the links of each cell as one byte in a flat,
+    row-major `bytearray`.
+    """
+
     def __init__(self, width: int, height: int) -> None:
         self._width = width
         self._height = height
         self._grid = self._prepare_grid()
 
-    def _prepare_grid(self) -> list[list[Direction]]:
-        row = [Direction.Empty] * self._width
-        grid = [row.copy() for _ in range(self._height)]
-        return grid
+    def _prepare_grid(self) -> bytearray:
+        return bytearray(self._width * self._height)
 
     @property
     def width(self) -> int:
@@ -110,34 +131,49 @@ class Grid(ImmutableGrid):
     def height(self) -> int:
         return self._height
 
+    @property
+    def cells(self) -> memoryview:
+        """
+        A read-only view of the links of every cell, in row-major order. This
+        does not copy.
+        """
+        return memoryview(self._grid).toreadonly()
+
     def __getitem__(self, index: Coordinate) -> Direction | None:
         if self.is_valid_coordinate(index):
-            x, y = index
-            return self._grid[y][x]
+            return DIRECTIONS[self._grid[self.index_of(index)]]
         else:
             return None
 
     def __iter__(self) -> Iterator[tuple[Coordinate, Direction]]:
+        grid = self._grid
+        index = 0
         for y in range(self._height):
             for x in range(self._width):
-                yield (x, y), self._grid[y][x]
+                yield (x, y), DIRECTIONS[grid[index]]
+                index += 1
 
     # Mutable Methods
 
     def __setitem__(self, index: Coordinate, direction: Direction) -> None:
         if self.is_valid_coordinate(index):
-            x, y = index
-            self._grid[y][x] = direction
+            self._grid[self.index_of(index)] = direction
+
+    def set_cells(self, cells: bytes | bytearray | memoryview) -> None:
+        """
+        Replaces the links of every cell, given in row-major order.
+        """
+        if len(cells) != len(self._grid):
+            raise ValueError(f"Expected {len(self._grid)} cells, got {len(cells)}")
+        self._grid[:] = cells
 
     def mark(self, coordinate: Coordinate, direction: Direction) -> None:
         if self.is_valid_coordinate(coordinate):
-            x, y = coordinate
-            self._grid[y][x] |= direction
+            self._grid[self.index_of(coordinate)] |= direction
 
     def unmark(self, coordinate: Coordinate, direction: Direction) -> None:
         if self.is_valid_coordinate(coordinate):
-            x, y = coordinate
-            self._grid[y][x] &= ~direction
+            self._grid[self.index_of(coordinate)] &= ~direction & Direction.All
 
     def link_path(self, start: Coordinate, directions: list[Direction]) -> Coordinate:
         current = start
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+import random
 from enum import Enum, auto
+from typing import TextIO
 
 from .algorithms import (
     Algorithm,
     BinaryTree,
-    Dijkstra,
+    BinaryTreeRandom,
+    BulkAlgorithm,
+    BulkBinaryTree,
+    BulkDijkstra,
+    BulkRecursiveBacktracker,
+    BulkSidewinder,
     RecursiveBacktracker,
+    RecursiveBacktrackerRandom,
     Sidewinder,
+    SidewinderRandom,
+    TreeDiameter,
 )
 from .core.maze_state import MutableMazeState
 from .distances import Distances
-from .grid import Grid, ImmutableGrid
+from .grid import Coordinate, Grid, ImmutableGrid
 from .renderers import Color, ImageRenderer, TextRenderer
 
 
@@ -35,42 +45,72 @@ class Maze:
         height: int,
         algorithmType: Maze.AlgorithmType,
         overlayType=OverlayType.Nothing,
+        bulk=False,
+        rng: random.Random | None = None,
     ) -> Maze:
+        """
+        Generates a maze. If `bulk` is set, the maze is generated in one pass by
+        the algorithm's bulk engine. Only the recursive backtracker draws
+        its random numbers in the same order either way, so for the others the
+        same seed gives a different maze.
+
+        Random numbers come from `rng`, or else from the `random` module.
+        """
         grid = Grid(width, height)
-        state = MutableMazeState(grid, (0, 0))
 
-        algorithm = Maze.make_algorithm(algorithmType, grid, state)
-        algorithm.generate()
+        if bulk:
+            Maze.make_bulk_algorithm(algorithmType, grid, rng).generate()
+        else:
+            state = MutableMazeState(grid, (0, 0), records_operations=False)
+            algorithm = Maze.make_algorithm(algorithmType, grid, state, rng)
+            algorithm.generate()
 
         return Maze(grid, overlayType)
 
     @classmethod
     def make_algorithm(
-        cls, mazeType: Maze.AlgorithmType, grid: Grid, state: MutableMazeState
+        cls,
+        mazeType: Maze.AlgorithmType,
+        grid: Grid,
+        state: MutableMazeState,
+        rng: random.Random | None = None,
     ) -> Algorithm:
         match mazeType:
             case Maze.AlgorithmType.BinaryTree:
-                return BinaryTree(state)
+                return BinaryTree(state, BinaryTreeRandom(rng))
             case Maze.AlgorithmType.Sidewinder:
-                return Sidewinder(state)
+                return Sidewinder(state, SidewinderRandom(rng))
             case Maze.AlgorithmType.RecursiveBacktracker:
-                return RecursiveBacktracker(state)
+                return RecursiveBacktracker(state, RecursiveBacktrackerRandom(rng))
+            case unknown:
+                raise ValueError(unknown)
+
+    @classmethod
+    def make_bulk_algorithm(
+        cls, mazeType: Maze.AlgorithmType, grid: Grid, rng: random.Random | None = None
+    ) -> BulkAlgorithm:
+        match mazeType:
+            case Maze.AlgorithmType.BinaryTree:
+                return BulkBinaryTree(grid, BinaryTreeRandom(rng))
+            case Maze.AlgorithmType.Sidewinder:
+                return BulkSidewinder(grid, SidewinderRandom(rng))
+            case Maze.AlgorithmType.RecursiveBacktracker:
+                return BulkRecursiveBacktracker(grid, RecursiveBacktrackerRandom(rng))
             case unknown:
                 raise ValueError(unknown)
 
     def __init__(self, grid: ImmutableGrid, overlayType: Maze.OverlayType) -> None:
         self._grid = grid
         self._overlayType = overlayType
-        self._dijkstra = self._generate_dijkstra()
-
-    def _generate_dijkstra(self) -> Dijkstra:
-        dijkstra: Dijkstra
-        if self._overlayType == Maze.OverlayType.Distance:
-            center = self._grid.center
-            dijkstra = Dijkstra(self._grid, center)
-        else:
-            dijkstra = Dijkstra(self._grid, (0, 0))
-        dijkstra.generate()
+        self._dijkstras: dict[Coordinate, BulkDijkstra] = {}
+        self._overlays: dict[Maze.OverlayType, Distances | None] = {}
+
+    def _dijkstra_from(self, root: Coordinate) -> BulkDijkstra:
+        dijkstra = self._dijkstras.get(root)
+        if dijkstra is None:
+            dijkstra = BulkDijkstra(self._grid, root)
+            dijkstra.generate()
+            self._dijkstras[root] = dijkstra
         return dijkstra
 
     @property
@@ -85,21 +125,36 @@ class Maze:
     def height(self) -> int:
         return self._grid.height
 
-    def distances(self) -> Distances | None:
-        match self._overlayType:
+    def distances(
+        self, overlayType: Maze.OverlayType | None = None
+    ) -> Distances | None:
+        """
+        The distances of `overlayType`, or else of the maze's own overlay. Each
+        overlay is only computed the first time it is asked for.
+        """
+        if overlayType is None:
+            overlayType = self._overlayType
+        if overlayType not in self._overlays:
+            self._overlays[overlayType] = self._compute_distances(overlayType)
+        return self._overlays[overlayType]
+
+    def _compute_distances(self, overlayType: Maze.OverlayType) -> Distances | None:
+        match overlayType:
             case Maze.OverlayType.Distance:
-                return self._dijkstra.distances
+                return self._dijkstra_from(self._grid.center).distances
 
             case Maze.OverlayType.PathTo:
                 goal = self._grid.southeast_corner
-                return self._dijkstra.path_to(goal)
+                return self._dijkstra_from((0, 0)).path_to(goal)
 
             case Maze.OverlayType.PathToMax:
-                goal = self._dijkstra.distances.max_coordinate
-                return self._dijkstra.path_to(goal)
+                dijkstra = self._dijkstra_from((0, 0))
+                return dijkstra.path_to(dijkstra.max_coordinate)
 
             case Maze.OverlayType.LongestPath:
-                return self._dijkstra.longest_path()
+                diameter = TreeDiameter(self._grid, (0, 0))
+                diameter.generate()
+                return diameter.path
 
             case Maze.OverlayType.Nothing:
                 return None
@@ -118,6 +173,10 @@ class Maze:
         text = renderer.render()
         return text
 
+    def write_text(self, stream: TextIO) -> None:
+        renderer = TextRenderer(self._grid, self.distances())
+        renderer.write(stream)
+
     def write_png(self, file_name: str) -> None:
         gradient_start, gradient_end = self.gradient()
         renderer = ImageRenderer(
@@ -0,0 +1,282 @@
+"""
+A compact binary file format for mazes.
+
+A file is a fixed-size header followed by the links of every cell in row-major
+order, either one byte per cell or packed two cells per byte, first cell in
+the high nibble. Files with one byte per cell can be memory-mapped and used as
+a grid without copying.
+"""
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from .direction import Coordinate, Direction
+from .grid import DIRECTIONS, ImmutableGrid
+from .maze_generator import AlgorithmType
+from .utils import bytewise_or
+
+_MAGIC = b"MAZE"
+_VERSION = 1
+_HAS_SEED = 1
+# Magic, version, bits per cell, algorithm, flags, width, height, seed
+_HEADER = struct.Struct("<4sBBBBIIQ")
+
+_HIGH_NIBBLE = bytes(links << 4 & 0xFF for links in range(256))
+_FROM_HIGH_NIBBLE = bytes(byte >> 4 for byte in range(256))
+_FROM_LOW_NIBBLE = bytes(byte & 0x0F for byte in range(256))
+
+# Cells checked at a time when loading
+_CHECK_CHUNK = 1 << 16
+# Links allowed anywhere, and along each edge, where they can't leave the grid
+_LINKS = bytes(range(Direction.All + 1))
+_NORTH_EDGE_LINKS = bytes(links for links in _LINKS if not links & Direction.N)
+_SOUTH_EDGE_LINKS = bytes(links for links in _LINKS if not links & Direction.S)
+_EAST_EDGE_LINKS = bytes(links for links in _LINKS if not links & Direction.E)
+_WEST_EDGE_LINKS = bytes(links for links in _LINKS if not links & Direction.W)
+
+
+class MazeFileError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class MazeFileHeader:
+    width: int
+    height: int
+    seed: int | None = None
+    algorithm: AlgorithmType | None = None
+    bits_per_cell: int = 8
+
+    @property
+    def cells_size(self) -> int:
+        count = self.width * self.height
+        return count if self.bits_per_cell == 8 else (count + 1) // 2
+
+    def pack(self) -> bytes:
+        if self.bits_per_cell not in (4, 8):
+            raise ValueError(f"Invalid bits per cell: {self.bits_per_cell}")
+        return _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            self.bits_per_cell,
+            self.algorithm.value if self.algorithm is not None else 0,
+            _HAS_SEED if self.seed is not None else 0,
+            self.width,
+            self.height,
+            self.seed or 0,
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes | memoryview) -> MazeFileHeader:
+        if len(data) < _HEADER.size:
+            raise MazeFileError("Truncated header")
+        (
+            magic,
+            version,
+            bits,
+            algorithm,
+            flags,
+            width,
+            height,
+            seed,
+        ) = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise MazeFileError("Not a maze file")
+        if version != _VERSION:
+            raise MazeFileError(f"Unsupported version: {version}")
+        if bits not in (4, 8):
+            raise MazeFileError(f"Invalid bits per cell: {bits}")
+        try:
+            algorithm_type = AlgorithmType(algorithm) if algorithm else None
+        except ValueError:
+            raise MazeFileError(f"Unknown algorithm: {algorithm}") from None
+        return MazeFileHeader(
+            width,
+            height,
+            seed if flags & _HAS_SEED else None,
+            algorithm_type,
+            bits,
+        )
+
+
+class StoredGrid(ImmutableGrid):
+    """
+    A read-only grid over the links of a maze file, which are either a view
+    into the memory-mapped file or unpacked from nibbles.
+    """
+
+    def __init__(
+        self,
+        header: MazeFileHeader,
+        cells: memoryview,
+        file_map: mmap.mmap | None = None,
+    ) -> None:
+        self._header = header
+        self._cells = cells
+        self._map = file_map
+
+    @property
+    def header(self) -> MazeFileHeader:
+        return self._header
+
+    @property
+    def width(self) -> int:
+        return self._header.width
+
+    @property
+    def height(self) -> int:
+        return self._header.height
+
+    @property
+    def cells(self) -> memoryview:
+        return self._cells
+
+    def __getitem__(self, index: Coordinate) -> Direction | None:
+        if self.is_valid_coordinate(index):
+            return DIRECTIONS[self._cells[self.index_of(index)]]
+        else:
+            return None
+
+    def __iter__(self) -> Iterator[tuple[Coordinate, Direction]]:
+        cells = self._cells
+        index = 0
+        for y in range(self.height):
+            for x in range(self.width):
+                yield (x, y), DIRECTIONS[cells[index]]
+                index += 1
+
+    def close(self) -> None:
+        """
+        Unmaps the file. Views of `cells` must be released first.
+        """
+        self._cells.release()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self) -> StoredGrid:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def write_maze(
+    stream: BinaryIO,
+    grid: ImmutableGrid,
+    seed: int | None = None,
+    algorithm: AlgorithmType | None = None,
+    bits_per_cell: int = 8,
+) -> None:
+    header = MazeFileHeader(grid.width, grid.height, seed, algorithm, bits_per_cell)
+    stream.write(header.pack())
+    cells = grid.cells
+    if bits_per_cell == 8:
+        stream.write(cells)
+    else:
+        stream.write(_pack_nibbles(bytes(cells)))
+
+
+def write_maze_file(
+    path: str | Path,
+    grid: ImmutableGrid,
+    seed: int | None = None,
+    algorithm: AlgorithmType | None = None,
+    bits_per_cell: int = 8,
+) -> None:
+    with open(path, "wb") as file:
+        write_maze(file, grid, seed, algorithm, bits_per_cell)
+
+
+def read_maze(data: bytes | bytearray | memoryview | mmap.mmap) -> StoredGrid:
+    """
+    Reads a maze from the contents of a maze file. Cells stored one per byte
+    are a view into `data`. Raises `MazeFileError` if the file is malformed or
+    any cell links off the grid.
+    """
+    view = memoryview(data).toreadonly()
+    cells: memoryview | None = None
+    try:
+        header = MazeFileHeader.unpack(view)
+        end = _HEADER.size + header.cells_size
+        if len(view) < end:
+            raise MazeFileError("Truncated cells")
+        if header.bits_per_cell == 4:
+            count = header.width * header.height
+            packed = view[slice(_HEADER.size, end)].tobytes()
+            cells = memoryview(bytes(_unpack_nibbles(packed, count)))
+        else:
+            cells = view[slice(_HEADER.size, end)]
+        _check_cells(header, cells)
+    except BaseException:
+        # Nothing may hold on to `data`, so a memory map can still be closed
+        if cells is not None:
+            cells.release()
+        view.release()
+        raise
+    return StoredGrid(header, cells)
+
+
+def load_maze_file(path: str | Path) -> StoredGrid:
+    """
+    Memory-maps a maze file. Close the grid to unmap it.
+    """
+    with open(path, "rb") as file:
+        file_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        grid = read_maze(file_map)
+    except BaseException:
+        file_map.close()
+        raise
+    if grid.header.bits_per_cell == 8:
+        return StoredGrid(grid.header, grid.cells, file_map)
+    file_map.close()
+    return grid
+
+
+def _check_cells(header: MazeFileHeader, cells: memoryview) -> None:
+    """
+    Checks the links of every cell, a chunk at a time so that cells mapped
+    from a file are not copied all at once. Slices of `cells` are not kept,
+    so it can be released when this raises.
+    """
+    width = header.width
+    height = header.height
+    if width == 0 or height == 0:
+        return
+
+    # Deleting every allowed value leaves only the invalid ones
+    for start in range(0, len(cells), _CHECK_CHUNK):
+        chunk = slice(start, start + _CHECK_CHUNK)
+        if cells[chunk].tobytes().translate(None, _LINKS):
+            raise MazeFileError("Invalid cell links")
+    edges = [
+        (slice(0, width), _NORTH_EDGE_LINKS, "north"),
+        (slice((height - 1) * width, None), _SOUTH_EDGE_LINKS, "south"),
+        (slice(width - 1, None, width), _EAST_EDGE_LINKS, "east"),
+        (slice(0, None, width), _WEST_EDGE_LINKS, "west"),
+    ]
+    for edge, allowed, name in edges:
+        if cells[edge].tobytes().translate(None, allowed):
+            raise MazeFileError(f"A cell links off the {name} edge")
+
+
+def _pack_nibbles(cells: bytes) -> bytes:
+    if len(cells) % 2:
+        cells += b"\x00"
+    high = cells[0::2].translate(_HIGH_NIBBLE)
+    low = cells[1::2]
+    return bytewise_or(high, low)
+
+
+def _unpack_nibbles(packed: bytes, count: int) -> bytearray:
+    cells = bytearray(len(packed) * 2)
+    cells[0::2] = packed.translate(_FROM_HIGH_NIBBLE)
+    cells[1::2] = packed.translate(_FROM_LOW_NIBBLE)
+    del cells[count:]
+    return cells
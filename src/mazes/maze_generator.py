@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import random
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from enum import Enum, auto
 
 from . import Coordinate, Grid, ImmutableGrid
-from .core.maze_state import MazeOperation, MazeState, MutableMazeState
+from .core.maze_state import MazeOperation, MazeState, MazeStep, MutableMazeState
 from .core.maze_stepper import MazeStepper
 
 
@@ -46,7 +47,7 @@ class MazeOptions:
 
 
 class MazeGenerator:
-    from .algorithms import Algorithm
+    from .algorithms import Algorithm, BulkAlgorithm
 
     def __init__(self, options: MazeOptions) -> None:
         self._width = options.width
@@ -56,27 +57,57 @@ class MazeGenerator:
         self._end = options.end
         self._maze_state = MutableMazeState(self._grid, self._start)
         self._algorithmType = options.algorithmType
-        self._algorithm = self._init_algorithm(options.algorithmType)
         self._seed = self._init_seed(options.seed)
+        self._rng = random.Random(self._seed)
+        self._algorithm = self._init_algorithm(options.algorithmType)
 
     def _init_algorithm(self, mazeType: AlgorithmType) -> Algorithm:
-        from .algorithms import BinaryTree, RecursiveBacktracker, Sidewinder
+        from .algorithms import (
+            BinaryTree,
+            BinaryTreeRandom,
+            RecursiveBacktracker,
+            RecursiveBacktrackerRandom,
+            Sidewinder,
+            SidewinderRandom,
+        )
 
         state = self._maze_state
+        rng = self._rng
+        match mazeType:
+            case AlgorithmType.BinaryTree:
+                return BinaryTree(state, BinaryTreeRandom(rng))
+            case AlgorithmType.Sidewinder:
+                return Sidewinder(state, SidewinderRandom(rng))
+            case AlgorithmType.RecursiveBacktracker:
+                return RecursiveBacktracker(state, RecursiveBacktrackerRandom(rng))
+            case unknown:
+                raise ValueError(unknown)
+
+    def _init_bulk_algorithm(self, mazeType: AlgorithmType) -> BulkAlgorithm:
+        from .algorithms import (
+            BinaryTreeRandom,
+            BulkBinaryTree,
+            BulkRecursiveBacktracker,
+            BulkSidewinder,
+            RecursiveBacktrackerRandom,
+            SidewinderRandom,
+        )
+
+        grid = self._grid
+        rng = self._rng
         match mazeType:
             case AlgorithmType.BinaryTree:
-                return BinaryTree(state)
+                return BulkBinaryTree(grid, BinaryTreeRandom(rng))
             case AlgorithmType.Sidewinder:
-                return Sidewinder(state)
+                return BulkSidewinder(grid, SidewinderRandom(rng))
             case AlgorithmType.RecursiveBacktracker:
-                return RecursiveBacktracker(state)
+                return BulkRecursiveBacktracker(grid, RecursiveBacktrackerRandom(rng))
             case unknown:
                 raise ValueError(unknown)
 
     def _init_seed(self, seed: int | None) -> int:
         if seed is None:
             seed = random.randint(0, 2**64 - 1)
-        random.seed(seed)
         return seed
 
     @property
@@ -107,8 +138,18 @@ class MazeGenerator:
     def targets(self) -> MazeState:
         return self._maze_state
 
+    def maze_steps(self) -> Iterator[MazeStep]:
+        return self._algorithm.maze_steps()
+
     def make_stepper(self) -> MazeStepper:
-        return MazeStepper(self._maze_state, self._algorithm.maze_steps())
+        return MazeStepper(self._maze_state, self.maze_steps())
+
+    def generate(self) -> None:
+        """
+        Generates the whole maze at once with the algorithm's bulk engine, for
+        when no steps are needed.
+        """
+        self._init_bulk_algorithm(self._algorithmType).generate()
 
     def apply_operation(self, operation: MazeOperation) -> None:
         self._maze_state.apply_operation(operation)
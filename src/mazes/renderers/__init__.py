@@ -1,2 +1,3 @@
 from .image_renderer import Color, ImageRenderer
+from .text_parser import TextParser
 from .text_renderer import TextRenderer
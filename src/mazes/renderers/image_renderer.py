@@ -1,12 +1,46 @@
+from collections.abc import Iterator, Sequence
 from enum import Enum, auto
+from typing import BinaryIO
 
 from PIL import Image, ImageDraw
 
+from ..direction import Direction
 from ..distances import Distances
-from ..grid import Coordinate, Direction, ImmutableGrid
+from ..grid import Coordinate, ImmutableGrid
+from ..utils import bytewise_or
+from .png_writer import PngColorType, write_png
 
 Color = tuple[int, int, int]
 
+_ALL = int(Direction.All)
+_BLACK = bytes((0, 0, 0, 255))
+_WHITE = bytes((255, 255, 255, 255))
+
+
+def _missing_table(direction: Direction) -> bytes:
+    """
+    A translation table from a cell's links to 1 if `direction` is missing.
+    """
+    return bytes(0 if links & direction else 1 for links in range(256))
+
+
+_NO_N = _missing_table(Direction.N)
+_NO_S = _missing_table(Direction.S)
+_NO_E = _missing_table(Direction.E)
+_NO_W = _missing_table(Direction.W)
+
+
+_ASCII_BITS = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def _pack_bits(line: bytes) -> bytes:
+    """
+    Packs a sequence of 0 and 1 into 1-bit pixels, most significant bit first.
+    """
+    size = (len(line) + 7) // 8
+    bits = line.translate(_ASCII_BITS).ljust(size * 8, b"0")
+    return int(bits, 2).to_bytes(size)
+
 
 class Mode(Enum):
     Backgrounds = auto()
@@ -31,10 +65,13 @@ class ImageRenderer:
         self._padding = padding
 
     def render_png_file(self, file_name: str) -> None:
-        image = self.render_png_image()
-        image.save(file_name)
+        with open(file_name, "wb") as file:
+            self.write_png(file)
 
     def render_png_image(self) -> Image.Image:
+        """
+        Renders the image by drawing every cell with `ImageDraw`.
+        """
         cell_size = self._cell_size
         padding = self._padding
         grid = self._grid
@@ -78,6 +115,11 @@ class ImageRenderer:
         if distance is None:
             return None
         max_distance = self._distances.max_distance
+        return self.color_of_distance(distance, max_distance)
+
+    def color_of_distance(self, distance: int, max_distance: int) -> Color:
+        if max_distance == 0:
+            return self._gradient_start
         intensity = float(max_distance - distance) / max_distance
         # r1, g1, b1 = (255, 0, 0)
         # r2, g2, b2 = (0, 255, 0)
@@ -87,3 +129,183 @@ class ImageRenderer:
         g = round((g1 - g2) * intensity) + g2
         b = round((b1 - b2) * intensity) + b2
         return (r, g, b)
+
+    def render_raster_image(self) -> Image.Image:
+        """
+        Renders the same image as `render_png_image`, but builds the pixels a
+        scanline at a time and hands them to Pillow once.
+        """
+        pixels, palette_of_distance = self._palette()
+        data = b"".join(self._scanlines(_BLACK, pixels, palette_of_distance))
+        return Image.frombuffer("RGBA", self.image_size, data, "raw", "RGBA", 0, 1)
+
+    def write_png(self, stream: BinaryIO) -> None:
+        """
+        Writes the image to `stream` as a PNG one scanline at a time, without
+        ever holding the whole image. Without distances the image is 1-bit
+        grayscale, otherwise it uses a palette when the colors fit in one.
+        """
+        width, height = self.image_size
+        pixels, palette_of_distance = self._palette()
+
+        rows: Iterator[bytes]
+        if self._distances is None:
+            rows = (
+                _pack_bits(line)
+                for line in self._scanlines(b"\x00", [b"\x01"], palette_of_distance)
+            )
+            write_png(stream, width, height, rows, PngColorType.Grayscale, 1)
+        elif len(pixels) < 256:
+            # Black goes last, after the background colors
+            indexes = [bytes([i]) for i in range(len(pixels))]
+            black = bytes([len(pixels)])
+            palette = [pixel[:3] for pixel in pixels] + [_BLACK[:3]]
+            rows = self._scanlines(black, indexes, palette_of_distance)
+            write_png(stream, width, height, rows, PngColorType.Palette, 8, palette)
+        else:
+            rgb = [pixel[:3] for pixel in pixels]
+            rows = self._scanlines(_BLACK[:3], rgb, palette_of_distance)
+            write_png(stream, width, height, rows, PngColorType.RGB, 8)
+
+    @property
+    def image_size(self) -> tuple[int, int]:
+        cell_size = self._cell_size
+        padding = self._padding
+        return (
+            cell_size * self._grid.width + padding * 2 + 1,
+            cell_size * self._grid.height + padding * 2 + 1,
+        )
+
+    def _scanlines(
+        self, black: bytes, pixels: list[bytes], palette_of_distance: Sequence[int]
+    ) -> Iterator[bytes]:
+        """
+        Yields the rows of the image, one row of cells at a time. Each pixel is
+        written as `black` or as the entry of `pixels` for its background, so
+        the same code produces RGBA, RGB or palette indexes.
+
+        Each cell owns the pixels from its top-left corner up to, but not
+        including, its right and bottom edges, which belong to its neighbors.
+        All pixel rows of a cell below its top edge are the same, so each row
+        of cells only builds two scanlines. An extra row and column of cells
+        past the grid supplies the right and bottom edges.
+
+        `ImageDraw` paints every cell's background, in white when it has no
+        distance, and overlapping edges take the color of the later cell. So
+        each pixel takes its own cell's color, except for the extra cells past
+        the grid, which paint nothing and take the color of their neighbors.
+        """
+        cell_size = self._cell_size
+        padding = self._padding
+        grid = self._grid
+        width = grid.width
+        height = grid.height
+
+        img_width, _ = self.image_size
+        pixel_size = len(black)
+        grid_width = (cell_size * width + 1) * pixel_size
+
+        white = pixels[0]
+        interiors = [pixel * (cell_size - 1) for pixel in pixels]
+        black_interior = black * (cell_size - 1)
+
+        blank_line = white * img_width
+        left_padding = white * padding
+        right_padding = white * padding
+        cells = grid.cells
+        values = self._distances.values if self._distances is not None else None
+
+        for _ in range(padding):
+            yield blank_line
+        above = bytes([_ALL]) * (width + 1)
+        above_colors = [-1] * (width + 1)
+        for y in range(height + 1):
+            # Color indexes are -1 for the extra cells, which paint nothing
+            if y < height:
+                row = slice(y * width, (y + 1) * width)
+                links = bytes(cells[row]) + bytes([_ALL])
+                if values is not None:
+                    colors = [palette_of_distance[d] for d in values[row]] + [-1]
+                else:
+                    colors = [0] * width + [-1]
+            else:
+                links = bytes([_ALL]) * (width + 1)
+                colors = [-1] * (width + 1)
+
+            left = bytes([_ALL]) + links[:-1]
+            above_left = bytes([_ALL]) + above[:-1]
+            left_colors = [-1] + colors[:-1]
+            above_left_colors = [-1] + above_colors[:-1]
+
+            west_walls = bytewise_or(links.translate(_NO_W), left.translate(_NO_E))
+            north_walls = bytewise_or(links.translate(_NO_N), above.translate(_NO_S))
+            corners = bytewise_or(
+                west_walls,
+                north_walls,
+                left.translate(_NO_N),
+                above_left.translate(_NO_S),
+                above.translate(_NO_W),
+                above_left.translate(_NO_E),
+            )
+
+            top = b"".join(
+                [
+                    (
+                        black
+                        if corner
+                        else pixels[
+                            c if c >= 0 else cl if cl >= 0 else ca if ca >= 0 else cal
+                        ]
+                    )
+                    + (black_interior if north else interiors[c if c >= 0 else ca])
+                    for c, cl, ca, cal, corner, north in zip(
+                        colors,
+                        left_colors,
+                        above_colors,
+                        above_left_colors,
+                        corners,
+                        north_walls,
+                    )
+                ]
+            )
+            yield left_padding + top[:grid_width] + right_padding
+
+            if y < height:
+                body = b"".join(
+                    [
+                        (black if west else pixels[c if c >= 0 else cl]) + interiors[c]
+                        for c, cl, west in zip(colors, left_colors, west_walls)
+                    ]
+                )
+                body_line = left_padding + body[:grid_width] + right_padding
+                for _ in range(cell_size - 1):
+                    yield body_line
+
+            above = links
+            above_colors = colors
+
+        for _ in range(padding):
+            yield blank_line
+
+    def _palette(self) -> tuple[list[bytes], Sequence[int]]:
+        """
+        Returns the distinct background pixels, with white first for cells
+        without a distance, and the index into them of each distance. The last
+        index is for `UNREACHED`, which is negative, so it is white too.
+        """
+        pixels = [_WHITE]
+        if self._distances is None:
+            return (pixels, [0])
+
+        index_of_pixel = {_WHITE: 0}
+        palette_of_distance: list[int] = []
+        max_distance = self._distances.max_distance
+        for distance in range(max_distance + 1):
+            r, g, b = self.color_of_distance(distance, max_distance)
+            pixel = bytes((r, g, b, 255))
+            if pixel not in index_of_pixel:
+                index_of_pixel[pixel] = len(pixels)
+                pixels.append(pixel)
+            palette_of_distance.append(index_of_pixel[pixel])
+        palette_of_distance.append(0)
+        return (pixels, palette_of_distance)
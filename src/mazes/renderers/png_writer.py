@@ -0,0 +1,62 @@
+import struct
+import zlib
+from collections.abc import Iterable
+from enum import IntEnum
+from typing import BinaryIO
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+_IDAT_SIZE = 1 << 16
+
+
+class PngColorType(IntEnum):
+    Grayscale = 0
+    RGB = 2
+    Palette = 3
+
+
+def write_png(
+    stream: BinaryIO,
+    width: int,
+    height: int,
+    rows: Iterable[bytes],
+    color_type: PngColorType,
+    bit_depth: int,
+    palette: list[bytes] | None = None,
+) -> None:
+    """
+    Writes a PNG to `stream` from its packed rows, compressing them as they
+    arrive, so the image never has to be held in memory.
+    """
+    header = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+    stream.write(_SIGNATURE)
+    _write_chunk(stream, b"IHDR", header)
+    if palette is not None:
+        _write_chunk(stream, b"PLTE", b"".join(palette))
+
+    compressor = zlib.compressobj()
+    pending: list[bytes] = []
+    pending_size = 0
+    count = 0
+    for row in rows:
+        # Every row starts with its filter type, which is always None
+        data = compressor.compress(b"\x00" + row)
+        count += 1
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+            if pending_size >= _IDAT_SIZE:
+                _write_chunk(stream, b"IDAT", b"".join(pending))
+                pending = []
+                pending_size = 0
+    if count != height:
+        raise ValueError(f"Expected {height} rows, got {count}")
+    pending.append(compressor.flush())
+    _write_chunk(stream, b"IDAT", b"".join(pending))
+    _write_chunk(stream, b"IEND", b"")
+
+
+def _write_chunk(stream: BinaryIO, kind: bytes, data: bytes) -> None:
+    stream.write(struct.pack(">I", len(data)))
+    stream.write(kind)
+    stream.write(data)
+    stream.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind))))
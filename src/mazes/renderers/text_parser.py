@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from ..algorithms.dijkstra import BulkDijkstra
+from ..direction import Direction
+from ..distances import UNREACHED, Distances
+from ..grid import Grid
+from ..utils import bytewise_or
+from .text_renderer import BASE_36
+
+# Translation tables from the characters of a boundary to the link it shows
+_EAST = bytes(Direction.E if c == ord(" ") else 0 for c in range(256))
+_SOUTH = bytes(Direction.S if c == ord(" ") else 0 for c in range(256))
+_EAST_TO_WEST = bytes.maketrans(bytes([Direction.E]), bytes([Direction.W]))
+_SOUTH_TO_NORTH = bytes.maketrans(bytes([Direction.S]), bytes([Direction.N]))
+_WITHOUT_SOUTH = bytes(links & ~Direction.S for links in range(256))
+
+# Distances too large for a single character are rendered as "!"
+_UNKNOWN = -2
+_DISTANCE_OF = {c: i for i, c in enumerate(BASE_36)} | {
+    " ": UNREACHED,
+    "!": _UNKNOWN,
+}
+
+
+class TextParser:
+    """
+    Reads mazes written by `TextRenderer` back into a grid and, when the
+    cells have contents, distances.
+
+    Lines are read one row of cells at a time, so only the grid itself is
+    held in memory. Distances of 62 or more are rendered as "!", so they are
+    recomputed from the cell at distance 0. Without one, only the grid is
+    returned.
+    """
+
+    @classmethod
+    def parse_text(
+        cls, text: str, with_distances=True
+    ) -> tuple[Grid, Distances | None]:
+        return TextParser(with_distances).parse(text.splitlines())
+
+    @classmethod
+    def parse_file(
+        cls, path: str | Path, with_distances=True
+    ) -> tuple[Grid, Distances | None]:
+        with open(path) as file:
+            return TextParser(with_distances).parse(file)
+
+    def __init__(self, with_distances=True) -> None:
+        self._with_distances = with_distances
+
+    def parse(self, lines: Iterable[str]) -> tuple[Grid, Distances | None]:
+        rows = self._lines(lines)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("No maze found")
+        width = self._width_of(*header)
+
+        cells = bytearray()
+        values = array("i")
+        has_distances = False
+        north = bytes(width)
+        for body_number, body in rows:
+            wall_number, wall = next(rows, (body_number + 1, ""))
+            self._check_row(body, body_number, wall, wall_number, width)
+
+            east = body.encode("ascii")[4::4].translate(_EAST)
+            east = east[:-1] + b"\x00"
+            west = (b"\x00" + east[:-1]).translate(_EAST_TO_WEST)
+            south = wall.encode("ascii")[2::4].translate(_SOUTH)
+            cells += bytewise_or(north, south, east, west)
+            north = south.translate(_SOUTH_TO_NORTH)
+
+            if self._with_distances:
+                contents = body[2::4]
+                has_distances = has_distances or not contents.isspace()
+                try:
+                    values.extend([_DISTANCE_OF[c] for c in contents])
+                except KeyError as e:
+                    raise ValueError(
+                        f"Invalid distance {e.args[0]!r} on line {body_number}"
+                    ) from None
+
+        height = len(cells) // width
+        if height == 0:
+            raise ValueError("No rows found")
+        # Nothing is past the bottom row
+        cells[-width:] = cells[-width:].translate(_WITHOUT_SOUTH)
+        grid = Grid(width, height)
+        grid.set_cells(cells)
+
+        if not has_distances:
+            return (grid, None)
+        if _UNKNOWN in values:
+            if 0 not in values:
+                return (grid, None)
+            self._fill_unknown(grid, values)
+        root = grid.coordinate_of(values.index(0)) if 0 in values else (0, 0)
+        max_coordinate = grid.coordinate_of(values.index(max(values)))
+        distances = Distances.from_flat(width, height, root, values, max_coordinate)
+        return (grid, distances)
+
+    def _fill_unknown(self, grid: Grid, values: array) -> None:
+        """
+        Replaces the unknown distances with those found by searching the grid
+        from the cell at distance 0.
+        """
+        dijkstra = BulkDijkstra(grid, grid.coordinate_of(values.index(0)))
+        dijkstra.generate()
+        found = dijkstra.distances.values
+        for index, value in enumerate(values):
+            if value == _UNKNOWN:
+                values[index] = found[index]
+
+    def _lines(self, lines: Iterable[str]) -> Iterator[tuple[int, str]]:
+        """
+        Yields the numbered lines without their line endings, skipping blank
+        lines before and after the maze.
+        """
+        for line_number, line in enumerate(lines, 1):
+            line = line.rstrip("\r\n")
+            if line:
+                yield (line_number, line)
+
+    def _width_of(self, line_number: int, line: str) -> int:
+        width, extra = divmod(len(line) - 1, 4)
+        if width == 0 or extra or line != "+" + "---+" * width:
+            raise ValueError(f"Invalid top wall on line {line_number}")
+        return width
+
+    def _check_row(
+        self, body: str, body_number: int, wall: str, wall_number: int, width: int
+    ) -> None:
+        size = width * 4 + 1
+        if len(body) != size or body[0] != "|" or body[-1] != "|":
+            raise ValueError(f"Invalid row on line {body_number}")
+        if len(wall) != size or wall[::4] != "+" * (width + 1):
+            raise ValueError(f"Invalid wall on line {wall_number}")
@@ -1,6 +1,11 @@
+from collections.abc import Iterator
+from typing import TextIO
+
 from ..distances import Distances
 from ..grid import Coordinate, Direction, ImmutableGrid
 
+BASE_36 = "0123456789" "abcdefghijklmnopqrstuvwxyz" "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
 
 class TextRenderer:
     @classmethod
@@ -15,31 +20,46 @@ class TextRenderer:
         self._distances = distances
 
     def render(self) -> str:
+        return "".join(self.lines())
+
+    def write(self, stream: TextIO) -> None:
+        """
+        Writes the maze to `stream` a line at a time, so only one row of cells
+        is held in memory.
+        """
+        for line in self.lines():
+            stream.write(line)
+
+    def lines(self) -> Iterator[str]:
+        """
+        Yields the lines of the maze, each ending with a newline.
+        """
         grid = self._grid
         width = grid.width
-        output = "+" + "---+" * width + "\n"
-        top = ""
-        bottom = ""
-        for coordinate, linked in grid:
-            x, y = coordinate
-            if x == 0:
-                top = "|"
-                bottom = "+"
-
-            contents = self.contents_of(coordinate)
-            body = f" {contents} "  # Three characters
-            east_boundary = " " if Direction.E in linked else "|"
-            top += body + east_boundary
-
-            south_boundary = "   " if Direction.S in linked else "---"
-            corner = "+"
-            bottom += south_boundary + corner
-
-            if x == width - 1:
-                output += top + "\n"
-                output += bottom + "\n"
-
-        return output
+        cells = grid.cells
+        east = int(Direction.E)
+        south = int(Direction.S)
+
+        yield "+" + "---+" * width + "\n"
+        for y in range(grid.height):
+            row = cells[slice(y * width, (y + 1) * width)]
+            contents = self._row_contents(y)
+            top = "".join(
+                [
+                    f" {c} " + (" " if links & east else "|")
+                    for c, links in zip(contents, row)
+                ]
+            )
+            bottom = "".join(["   +" if links & south else "---+" for links in row])
+            yield "|" + top + "\n"
+            yield "+" + bottom + "\n"
+
+    def _row_contents(self, y: int) -> list[str]:
+        width = self._grid.width
+        if self._distances is None:
+            return [" "] * width
+        values = self._distances.values[slice(y * width, (y + 1) * width)]
+        return [" " if d < 0 else self.to_base36(d) for d in values]
 
     def contents_of(self, coordinate: Coordinate) -> str:
         if self._distances is None:
@@ -51,7 +71,6 @@ class TextRenderer:
         return self.to_base36(distance)
 
     def to_base36(self, i: int) -> str:
-        BASE_36 = "0123456789" "abcdefghijklmnopqrstuvwxyz" "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
         if i < len(BASE_36):
             return BASE_36[i]
         else:
@@ -0,0 +1,9 @@
+def bytewise_or(first: bytes, *others: bytes) -> bytes:
+    """
+    ORs byte sequences of the same length together, byte by byte, as single
+    big integers rather than one byte at a time.
+    """
+    value = int.from_bytes(first)
+    for other in others:
+        value |= int.from_bytes(other)
+    return value.to_bytes(len(first))
@@ -1,5 +1,5 @@
 from mazes import MutableMazeState
-from mazes.algorithms import BinaryTree, BinaryTreeRandom
+from mazes.algorithms import BinaryTree, BinaryTreeRandom, BulkBinaryTree
 from mazes.algorithms.utils import flatten
 from mazes.grid import Direction as D
 from mazes.grid import Grid
@@ -19,6 +19,15 @@ class FakeBinaryTreeRandom(BinaryTreeRandom):
         return direction
 
 
+class FakeCoinFlips(BinaryTreeRandom):
+    def __init__(self, flips: list[int]) -> None:
+        self._flips = flips
+
+    def coin_flips(self, count: int) -> bytes:
+        assert count == len(self._flips)
+        return bytes(self._flips)
+
+
 class TestBinaryTree:
     def test_binary_tree(self):
         grid = Grid(3, 3)
@@ -42,6 +51,48 @@ class TestBinaryTree:
             """
         assert_render(text, expected)
 
+    def test_bulk_binary_tree(self):
+        grid = Grid(3, 3)
+
+        # 1 carves north, 0 carves east. The northern row and eastern column
+        # are forced, whatever the flip.
+        flips = [
+            [1, 1, 1],  # y = 0
+            [1, 0, 1],  # y = 1
+            [0, 1, 1],  # y = 2
+        ]
+        BulkBinaryTree(grid, FakeCoinFlips(flatten(flips))).generate()
+        text = TextRenderer.render_grid(grid)
+
+        expected = """
+            +---+---+---+
+            |           |
+            +   +---+   +
+            |   |       |
+            +---+   +   +
+            |       |   |
+            +---+---+---+
+            """
+        assert_render(text, expected)
+
+    def test_bulk_binary_tree_is_perfect(self):
+        grid = Grid(7, 5)
+
+        BulkBinaryTree(grid).generate()
+
+        link_count = sum(bin(links).count("1") for _, links in grid)
+        assert link_count == 2 * (grid.width * grid.height - 1)
+        assert all(links for _, links in grid)
+
+    def test_bulk_binary_tree_single_column(self):
+        grid = Grid(1, 3)
+
+        BulkBinaryTree(grid).generate()
+
+        assert grid[0, 0] == D.S
+        assert grid[0, 1] == D.N | D.S
+        assert grid[0, 2] == D.N
+
     def render_grid(self, state: MutableMazeState, fake_directions: list[D]) -> str:
         random = FakeBinaryTreeRandom(fake_directions)
         binary_tree = BinaryTree(state, random)
@@ -1,7 +1,8 @@
 import pytest
 
-from mazes.algorithms import Dijkstra
+from mazes.algorithms import BulkDijkstra, Dijkstra
 from mazes.core import MutableMazeState
+from mazes.distances import UNREACHED
 from mazes.grid import Direction as D
 from mazes.grid import Grid
 from mazes.renderers import TextRenderer
@@ -67,7 +68,6 @@ class TestDijkstra:
         assert distances.max_coordinate == (3, 3)
         assert distances.max_distance == 8
 
-    @pytest.mark.skip
     def test_longest_path(self):
         grid = self.make_grid()
         state = MutableMazeState(grid, (0, 0))
@@ -88,6 +88,72 @@ class TestDijkstra:
         assert distances.max_distance == 9
         assert distances.max_coordinate == (0, 0)
 
+    def test_bulk_distances(self):
+        dijkstra = BulkDijkstra(self.make_grid(), (0, 0))
+        dijkstra.generate()
+        distances = dijkstra.distances
+
+        expected = [
+            [0, 1, 2, 9],
+            [7, 4, 3, 8],
+            [6, 5, 6, 7],
+            [7, 8, 7, 8],
+        ]
+
+        assert_distances(distances, expected)
+        assert distances.root == (0, 0)
+        assert distances.max_coordinate == (3, 0)
+        assert distances.max_distance == 9
+        assert dijkstra.max_coordinate == (3, 0)
+        assert dijkstra.max_distance == 9
+
+    def test_bulk_unreached_cells(self):
+        grid = Grid(3, 1)
+        grid.link((0, 0), D.E)
+        dijkstra = BulkDijkstra(grid, (0, 0))
+        dijkstra.generate()
+
+        assert list(dijkstra.distances.values) == [0, 1, UNREACHED]
+        assert dijkstra.distances[2, 0] is None
+        with pytest.raises(ValueError):
+            dijkstra.path_to((2, 0))
+
+    def test_bulk_path_to(self):
+        dijkstra = BulkDijkstra(self.make_grid(), (0, 0))
+        dijkstra.generate()
+
+        distances = dijkstra.path_to((3, 3))
+
+        N = None
+        expected = [
+            [0, 1, 2, N],
+            [N, 4, 3, N],
+            [N, 5, 6, N],
+            [N, N, 7, 8],
+        ]
+        assert_distances(distances, expected)
+        assert distances.root == (0, 0)
+        assert distances.max_coordinate == (3, 3)
+        assert distances.max_distance == 8
+
+    def test_bulk_longest_path(self):
+        dijkstra = BulkDijkstra(self.make_grid(), (0, 0))
+        dijkstra.generate()
+
+        distances = dijkstra.longest_path()
+
+        N = None
+        expected = [
+            [9, 8, 7, 0],
+            [N, 5, 6, 1],
+            [N, 4, 3, 2],
+            [N, N, N, N],
+        ]
+        assert_distances(distances, expected)
+        assert distances.root == (3, 0)
+        assert distances.max_distance == 9
+        assert distances.max_coordinate == (0, 0)
+
     def generate_dijkstra(self) -> Dijkstra:
         grid = self.make_grid()
         state = MutableMazeState(grid, (0, 0))
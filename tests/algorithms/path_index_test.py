@@ -0,0 +1,86 @@
+import itertools
+
+import pytest
+
+from mazes.algorithms import BulkDijkstra, BulkRecursiveBacktracker, PathIndex
+from mazes.grid import Direction as D
+from mazes.grid import Grid
+
+
+class TestPathIndex:
+    def test_distance(self):
+        index = PathIndex(self.make_grid())
+        index.generate()
+
+        assert index.distance((0, 0), (0, 0)) == 0
+        assert index.distance((0, 0), (3, 0)) == 9
+        assert index.distance((3, 0), (0, 0)) == 9
+        assert index.distance((0, 3), (3, 3)) == 5
+        assert index.distance((2, 0), (2, 1)) == 1
+
+    def test_common_ancestor(self):
+        index = PathIndex(self.make_grid())
+        index.generate()
+
+        assert index.common_ancestor((0, 3), (3, 3)) == (1, 2)
+        assert index.common_ancestor((3, 0), (3, 3)) == (2, 2)
+        assert index.common_ancestor((1, 1), (0, 0)) == (0, 0)
+
+    def test_path(self):
+        index = PathIndex(self.make_grid())
+        index.generate()
+
+        assert index.path((0, 3), (3, 3)) == [
+            (0, 3),
+            (0, 2),
+            (1, 2),
+            (2, 2),
+            (2, 3),
+            (3, 3),
+        ]
+        assert index.path((1, 1), (1, 1)) == [(1, 1)]
+
+    def test_matches_breadth_first_search(self):
+        grid = Grid(9, 7)
+        BulkRecursiveBacktracker(grid).generate()
+        index = PathIndex(grid, (4, 3))
+        index.generate()
+
+        for a in [(0, 0), (8, 6), (3, 5)]:
+            dijkstra = BulkDijkstra(grid, a)
+            dijkstra.generate()
+            for b in itertools.islice(grid.coordinates(), 0, None, 5):
+                assert index.distance(a, b) == dijkstra.distances[b]
+                assert len(index.path(a, b)) == index.distance(a, b) + 1
+
+    def test_unreachable_cell(self):
+        grid = Grid(2, 1)
+        index = PathIndex(grid)
+        index.generate()
+
+        with pytest.raises(ValueError):
+            index.distance((0, 0), (1, 0))
+        with pytest.raises(IndexError):
+            index.distance((0, 0), (2, 0))
+
+    def make_grid(self) -> Grid:
+        #  0   1   2   3
+        # +---+---+---+---+
+        # |           |   |  0
+        # +---+---+   +   +
+        # |   |       |   |  1
+        # +   +   +---+   +
+        # |               |  2
+        # +   +---+   +---+
+        # |   |           |  3
+        # +---+---+---+---+
+        grid = Grid(4, 4)
+        grid.link_path((0, 0), [D.E, D.E, D.S, D.W, D.S])
+        grid.link_path((1, 2), [D.W, D.N])
+        grid.link_path((0, 2), [D.S])
+        grid.link_path((1, 2), [D.E])
+        grid.link_path((2, 2), [D.E, D.N, D.N])
+        grid.link_path((2, 2), [D.S])
+        grid.link_path((2, 3), [D.E])
+        grid.link_path((2, 3), [D.W])
+        return grid
@@ -1,4 +1,10 @@
-from mazes.algorithms import RecursiveBacktracker, RecursiveBacktrackerRandom
+import random
+
+from mazes.algorithms import (
+    BulkRecursiveBacktracker,
+    RecursiveBacktracker,
+    RecursiveBacktrackerRandom,
+)
 from mazes.algorithms.utils import flatten
 from mazes.core.maze_state import MutableMazeState
 from mazes.direction import Direction as D
@@ -52,6 +58,58 @@ class TestRecursiveBacktracker:
             """
         assert_render(text, expected)
 
+    def test_headless_matches_recorded(self) -> None:
+        directions = [
+            [D.N, D.E, D.S, D.S, D.S, D.W, D.N],
+            [D.E, D.N, D.E, D.S],
+            [D.N, D.N, D.W, D.S],
+        ]
+
+        grid = Grid(4, 4)
+        state = MutableMazeState(grid, (0, 1))
+        self.make_algorithm(grid, (0, 1), flatten(directions), state).generate()
+
+        headless_grid = Grid(4, 4)
+        headless = MutableMazeState(headless_grid, (0, 1), records_operations=False)
+        algo = self.make_algorithm(headless_grid, (0, 1), flatten(directions), headless)
+        algo.generate()
+
+        assert list(headless_grid) == list(grid)
+
+    def test_bulk_matches_stepping_for_same_seed(self) -> None:
+        grid = Grid(12, 9)
+        state = MutableMazeState(grid, (0, 0))
+        rng = random.Random(1234)
+        RecursiveBacktracker(state, RecursiveBacktrackerRandom(rng)).generate()
+
+        bulk_grid = Grid(12, 9)
+        bulk_rng = random.Random(1234)
+        BulkRecursiveBacktracker(
+            bulk_grid, RecursiveBacktrackerRandom(bulk_rng)
+        ).generate()
+
+        assert list(bulk_grid) == list(grid)
+
+    def test_default_random_follows_global_seed(self) -> None:
+        random.seed(1234)
+        grid = Grid(12, 9)
+        BulkRecursiveBacktracker(grid).generate()
+
+        random.seed(1234)
+        other_grid = Grid(12, 9)
+        BulkRecursiveBacktracker(other_grid).generate()
+
+        assert list(other_grid) == list(grid)
+
+    def test_bulk_is_perfect(self) -> None:
+        grid = Grid(9, 6)
+
+        BulkRecursiveBacktracker(grid).generate()
+
+        link_count = sum(bin(links).count("1") for _, links in grid)
+        assert link_count == 2 * (grid.width * grid.height - 1)
+        assert all(links for _, links in grid)
+
     def make_algorithm(
         self,
         grid: Grid,
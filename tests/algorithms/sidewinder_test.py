@@ -1,6 +1,6 @@
 from collections.abc import Sequence
 
-from mazes.algorithms import Sidewinder, SidewinderRandom
+from mazes.algorithms import BulkSidewinder, Sidewinder, SidewinderRandom
 from mazes.algorithms.utils import flatten
 from mazes.core.maze_state import MutableMazeState
 from mazes.grid import Coordinate, Grid
@@ -23,6 +23,34 @@ class FakeSidewinderRandom(SidewinderRandom):
         # Always choose the last item
         return coords[-1]
 
+    def close_out_flips(self, count: int) -> bytes:
+        flips = [self.should_close_out() for _ in range(count)]
+        return bytes(flips)
+
+    def choose_north_offset(self, length: int) -> int:
+        # Always choose the last item
+        return length - 1
+
+
+class FakeChoosingSidewinderRandom(FakeSidewinderRandom):
+    """
+    Chooses north carves from its own sequence of offsets, which `Sidewinder`
+    and `BulkSidewinder` both draw from in the same order.
+    """
+
+    def __init__(self, should_close_out: list[bool], offsets: list[int]) -> None:
+        super().__init__(should_close_out)
+        self._offsets = offsets
+        self._offsets_index = 0
+
+    def choose_north(self, coords: Sequence[Coordinate]) -> Coordinate:
+        return coords[self.choose_north_offset(len(coords))]
+
+    def choose_north_offset(self, length: int) -> int:
+        offset = self._offsets[self._offsets_index % len(self._offsets)]
+        self._offsets_index += 1
+        return offset % length
+
 
 class TestSidewinder:
     def test_sidewinder_operations(self):
@@ -50,3 +78,63 @@ class TestSidewinder:
             +---+---+---+
             """
         assert_render(text, expected)
+
+    def test_bulk_sidewinder(self):
+        grid = Grid(3, 3)
+        should_close_out = [
+            [False, False],  # y == 2
+            [True, False],  # y == 1
+        ]
+
+        random = FakeSidewinderRandom(flatten(should_close_out))
+        BulkSidewinder(grid, random).generate()
+
+        text = TextRenderer.render_grid(grid)
+
+        expected = """
+            +---+---+---+
+            |           |
+            +   +---+   +
+            |   |       |
+            +---+---+   +
+            |           |
+            +---+---+---+
+            """
+        assert_render(text, expected)
+
+    def test_bulk_sidewinder_matches_stepping(self):
+        should_close_out = [i % 3 == 0 or i % 7 == 0 for i in range(9 * 6)]
+        offsets = [0, 2, 1, 5, 3, 4]
+
+        grid = Grid(10, 7)
+        state = MutableMazeState(grid, (0, 0))
+        random = FakeChoosingSidewinderRandom(should_close_out, offsets)
+        Sidewinder(state, random).generate()
+
+        bulk_grid = Grid(10, 7)
+        bulk_random = FakeChoosingSidewinderRandom(should_close_out, offsets)
+        BulkSidewinder(bulk_grid, bulk_random).generate()
+
+        last_chosen = FakeSidewinderRandom(should_close_out)
+        last_grid = Grid(10, 7)
+        BulkSidewinder(last_grid, last_chosen).generate()
+        assert list(bulk_grid) != list(last_grid)
+
+        assert list(bulk_grid) == list(grid)
+
+    def test_bulk_sidewinder_is_perfect(self):
+        grid = Grid(9, 6)
+
+        BulkSidewinder(grid).generate()
+
+        link_count = sum(bin(links).count("1") for _, links in grid)
+        assert link_count == 2 * (grid.width * grid.height - 1)
+        assert all(links for _, links in grid)
+
+    def test_bulk_sidewinder_empty_grid(self):
+        for width, height in [(0, 0), (0, 3), (3, 0)]:
+            grid = Grid(width, height)
+
+            BulkSidewinder(grid).generate()
+
+            assert list(grid) == []
@@ -0,0 +1,77 @@
+import pytest
+
+from mazes.algorithms import BulkRecursiveBacktracker, TreeDiameter
+from mazes.grid import Direction as D
+from mazes.grid import Grid
+
+from ..asserts import assert_distances
+
+
+class TestTreeDiameter:
+    def test_longest_path(self):
+        diameter = TreeDiameter(self.make_grid())
+        diameter.generate()
+
+        N = None
+        expected = [
+            [9, 8, 7, 0],
+            [N, 5, 6, 1],
+            [N, 4, 3, 2],
+            [N, N, N, N],
+        ]
+        assert_distances(diameter.path, expected)
+        assert diameter.endpoints == ((3, 0), (0, 0))
+        assert diameter.length == 9
+
+    def test_longest_path_from_other_start(self):
+        diameter = TreeDiameter(self.make_grid(), (3, 3))
+        diameter.generate()
+
+        assert diameter.length == 9
+        assert set(diameter.endpoints) == {(0, 0), (3, 0)}
+
+    def test_single_cell(self):
+        diameter = TreeDiameter(Grid(1, 1))
+        diameter.generate()
+
+        assert diameter.endpoints == ((0, 0), (0, 0))
+        assert diameter.length == 0
+        assert diameter.path[0, 0] == 0
+
+    def test_path_is_connected(self):
+        grid = Grid(20, 15)
+        BulkRecursiveBacktracker(grid).generate()
+
+        diameter = TreeDiameter(grid)
+        diameter.generate()
+
+        path = diameter.path
+        cells = [coord for coord in path.coordinates() if path[coord] is not None]
+        assert len(cells) == diameter.length + 1
+        for coord in cells:
+            distance = path[coord]
+            assert distance is not None
+            if distance > 0:
+                linked = grid[coord]
+                assert linked is not None
+                neighbors = [dir.update_coordinate(coord) for dir in linked]
+                assert any(path[n] == distance - 1 for n in neighbors)
+
+    def test_loop_is_rejected(self):
+        grid = Grid(2, 2)
+        grid.link_path((0, 0), [D.E, D.S, D.W, D.N])
+
+        with pytest.raises(ValueError):
+            TreeDiameter(grid).generate()
+
+    def make_grid(self) -> Grid:
+        grid = Grid(4, 4)
+        grid.link_path((0, 0), [D.E, D.E, D.S, D.W, D.S])
+        grid.link_path((1, 2), [D.W, D.N])
+        grid.link_path((0, 2), [D.S])
+        grid.link_path((1, 2), [D.E])
+        grid.link_path((2, 2), [D.E, D.N, D.N])
+        grid.link_path((2, 2), [D.S])
+        grid.link_path((2, 3), [D.E])
+        grid.link_path((2, 3), [D.W])
+        return grid
@@ -0,0 +1,101 @@
+import random
+from collections import Counter
+
+import pytest
+
+from mazes import Direction as D
+from mazes.algorithms.utils import (
+    RandomBuffer,
+    check_tree_size,
+    in_grid_directions,
+    neighbor_table,
+)
+
+
+class TestRandomBuffer:
+    @pytest.mark.parametrize("n", [1, 2, 3, 4, 7])
+    def test_below_covers_range(self, n):
+        buffer = RandomBuffer(random.Random(5), batch_size=16)
+
+        draws = {buffer.below(n) for _ in range(1000)}
+
+        assert draws == set(range(n))
+
+    def test_below_large_range(self):
+        buffer = RandomBuffer(random.Random(5))
+
+        assert all(0 <= buffer.below(300) < 300 for _ in range(1000))
+
+    def test_below_is_unbiased(self):
+        buffer = RandomBuffer(random.Random(5))
+
+        counts = Counter(buffer.below(3) for _ in range(30000))
+
+        assert all(9500 < count < 10500 for count in counts.values())
+
+    def test_same_seed_same_draws(self):
+        first = RandomBuffer(random.Random(8), batch_size=7)
+        second = RandomBuffer(random.Random(8), batch_size=7)
+
+        assert [first.below(4) for _ in range(50)] == [
+            second.below(4) for _ in range(50)
+        ]
+        assert first.take(20) == second.take(20)
+
+    def test_take_drains_the_buffer_first(self):
+        buffer = RandomBuffer(random.Random(3), batch_size=8)
+        expected = random.Random(3).randbytes(8)
+        buffer.below(2)
+
+        taken = buffer.take(10)
+
+        assert len(taken) == 10
+        assert taken[:7] == expected[1:]
+
+    def test_follows_global_seed(self):
+        first = RandomBuffer()
+        second = RandomBuffer()
+
+        random.seed(6)
+        first_draws = first.take(10)
+        random.seed(6)
+        second_draws = second.take(10)
+
+        assert first_draws == second_draws
+
+    def test_takes_one_seed_from_global_random(self):
+        random.seed(6)
+        RandomBuffer().take(100)
+        after = random.random()
+
+        random.seed(6)
+        random.getrandbits(64)
+
+        assert random.random() == after
+
+
+class TestNeighbors:
+    def test_neighbor_table(self):
+        neighbors = neighbor_table(5)
+
+        assert neighbors[D.Empty] == ()
+        assert neighbors[D.N | D.W] == ((D.N, D.S, -5), (D.W, D.E, -1))
+        assert [offset for _, _, offset in neighbors[D.All]] == [-5, 5, 1, -1]
+
+    def test_in_grid_directions(self):
+        assert list(in_grid_directions(3, 2)) == [
+            D.S | D.E,
+            D.S | D.E | D.W,
+            D.S | D.W,
+            D.N | D.E,
+            D.N | D.E | D.W,
+            D.N | D.W,
+        ]
+        assert list(in_grid_directions(1, 1)) == [D.Empty]
+        assert list(in_grid_directions(0, 3)) == []
+
+    def test_check_tree_size(self):
+        check_tree_size(4, 4)
+
+        with pytest.raises(ValueError):
+            check_tree_size(5, 4)
@@ -0,0 +1,36 @@
+import json
+
+from mazes.benchmark import benchmarks, results_to_json, run_suite
+
+
+class TestBenchmark:
+    def test_every_benchmark_runs(self):
+        results = run_suite([3], measure_memory=False)
+
+        assert [result.name for result in results] == [
+            benchmark.name for benchmark in benchmarks()
+        ]
+        assert all(result.count > 0 for result in results)
+        assert all(result.peak_bytes is None for result in results)
+
+    def test_stepping_limit(self):
+        results = run_suite([3, 5], stepping_limit=4, selected="generate/sidewinder")
+
+        assert [(result.name, result.size) for result in results] == [
+            ("generate/sidewinder/stepping", 3),
+            ("generate/sidewinder/headless", 3),
+            ("generate/sidewinder/bulk", 3),
+            ("generate/sidewinder/bulk", 5),
+        ]
+        assert all(result.peak_bytes is not None for result in results)
+
+    def test_json(self):
+        results = run_suite([4], selected="solve/dijkstra/bulk")
+
+        data = json.loads(json.dumps(results_to_json(results)))
+
+        assert data["results"][0]["name"] == "solve/dijkstra/bulk"
+        assert data["results"][0]["count"] == 16
+        assert data["results"][0]["unit"] == "cells"
+        assert data["results"][0]["rate"] > 0
+        assert "python" in data
@@ -0,0 +1,83 @@
+import json
+
+import pytest
+
+from mazes.command_line import CommandError, CommandLine, derive_seed
+
+
+class TestBatch:
+    def test_batch_is_deterministic(self, tmp_path):
+        serial = self.make_batch(tmp_path / "serial", jobs=1)
+        parallel = self.make_batch(tmp_path / "parallel", jobs=2)
+
+        serial.run()
+        parallel.run()
+
+        for index in range(5):
+            file = f"maze-{index}.txt"
+            expected = (tmp_path / "serial" / file).read_text()
+            assert (tmp_path / "parallel" / file).read_text() == expected
+
+    def test_manifest(self, tmp_path):
+        cli = self.make_batch(tmp_path, jobs=1)
+
+        cli.run()
+
+        manifest = json.loads((tmp_path / "manifest.json").read_text())
+        assert manifest["seed"] == 17
+        assert manifest["bulk"] is False
+        assert manifest["mazes"][3] == {
+            "index": 3,
+            "seed": derive_seed(17, 3),
+            "file": "maze-3.txt",
+        }
+
+    @pytest.mark.parametrize("bulk", [False, True])
+    def test_maze_matches_its_seed(self, tmp_path, capsys, bulk):
+        batch = self.make_batch(tmp_path, jobs=1)
+        batch.bulk = bulk
+        batch.run()
+        cli = CommandLine()
+        cli.width, cli.height = batch.width, batch.height
+        cli.algorithm = batch.algorithm
+        cli.overlay_type = batch.overlay_type
+        cli.seed = derive_seed(17, 2)
+        cli.bulk = bulk
+        capsys.readouterr()
+
+        cli.run()
+
+        expected = (tmp_path / "maze-2.txt").read_text()
+        assert capsys.readouterr().out.startswith(expected)
+
+    def test_batch_keeps_output(self, tmp_path):
+        cli = self.make_batch(tmp_path, jobs=1)
+
+        cli.run()
+
+        assert cli.output is None
+
+    def test_needs_output_dir(self):
+        cli = CommandLine()
+        cli.count = 2
+
+        with pytest.raises(CommandError):
+            cli.run()
+
+    def test_derive_seed(self):
+        assert derive_seed(1, 0) == derive_seed(1, 0)
+        assert derive_seed(1, 0) != derive_seed(1, 1)
+        assert derive_seed(1, 0) != derive_seed(2, 0)
+        assert 0 <= derive_seed(1, 0) < 2**64
+
+    def make_batch(self, output_dir, jobs: int) -> CommandLine:
+        cli = CommandLine()
+        cli.width = 6
+        cli.height = 4
+        cli.algorithm = "sidewinder"
+        cli.overlay_type = "distance"
+        cli.seed = 17
+        cli.count = 5
+        cli.jobs = jobs
+        cli.output_dir = str(output_dir)
+        return cli
@@ -1,4 +1,8 @@
-from mazes import Distances
+from array import array
+
+import pytest
+
+from mazes import UNREACHED, Distances
 
 
 class TestDistances:
@@ -40,3 +44,30 @@ class TestDistances:
 
         assert distances[(0, 1)] is None
         assert distances[(1, 1)] == 2
+
+    def test_values(self) -> None:
+        distances = Distances(3, 2, (0, 0))
+        distances[0, 0] = 0
+        distances[1, 1] = 2
+
+        values = distances.values
+
+        assert values.readonly
+        assert values.format == "i"
+        assert values.itemsize == 4
+        assert list(values) == [0, UNREACHED, UNREACHED, UNREACHED, 2, UNREACHED]
+
+    def test_from_flat_shares_array(self) -> None:
+        values = array("i", [0, 1, UNREACHED, 2])
+
+        distances = Distances.from_flat(2, 2, (0, 0), values, (1, 1))
+        values[2] = 3
+
+        assert distances[0, 1] == 3
+        assert distances[1, 1] == 2
+        assert distances.max_coordinate == (1, 1)
+        assert distances.max_distance == 2
+
+    def test_from_flat_wrong_size(self) -> None:
+        with pytest.raises(ValueError):
+            Distances.from_flat(2, 2, (0, 0), [0, 1, 2], (0, 0))
@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from mazes import AlgorithmType, MazeGenerator, MazeOptions, MazeStepper
+from mazes.game.generation_worker import GenerationWorker
+
+
+class TestGenerationWorker:
+    @pytest.mark.parametrize("algorithm", list(AlgorithmType))
+    def test_same_steps_as_generator(self, algorithm):
+        options = MazeOptions(12, 8, algorithm, seed=11)
+        expected = MazeGenerator(options)
+        expected_stepper = expected.make_stepper()
+        expected_stepper.step_forward_until_end()
+        maze = MazeGenerator(options)
+        worker = GenerationWorker(options, max_queued=4)
+
+        stepper = MazeStepper(maze.mutable_state, worker.steps(maze.mutable_state))
+        stepper.step_forward_until_end()
+        worker.stop()
+
+        assert worker.is_ready
+        assert bytes(maze.grid.cells) == bytes(expected.grid.cells)
+        assert len(stepper.log) == len(expected_stepper.log)
+        assert stepper.step_backward()
+
+    def test_stop_ends_steps(self):
+        options = MazeOptions(30, 30, seed=1)
+        maze = MazeGenerator(options)
+        worker = GenerationWorker(options, max_queued=2)
+        steps = worker.steps(maze.mutable_state)
+        next(steps)
+
+        worker.stop()
+
+        assert list(steps) == []
+        assert worker.is_ready
+
+    def test_stop_does_not_wait_for_a_full_queue(self):
+        options = MazeOptions(30, 30, seed=1)
+        worker = GenerationWorker(options, max_queued=2)
+        while not worker.is_ready:
+            time.sleep(0.001)
+
+        start = time.perf_counter()
+        worker.stop()
+
+        assert time.perf_counter() - start < 0.05
@@ -0,0 +1,73 @@
+from mazes.game.step_budget import StepBudget
+
+
+class Counter:
+    def __init__(self, limit: int = 1000) -> None:
+        self.count = 0
+        self.limit = limit
+
+    def step(self) -> bool:
+        if self.count == self.limit:
+            return False
+        self.count += 1
+        return True
+
+
+class TestStepBudget:
+    def test_takes_every_step_within_budget(self):
+        budget = StepBudget(1000.0)
+        counter = Counter()
+
+        assert budget.take_steps(5, counter.step)
+
+        assert counter.count == 5
+        assert budget.carried_steps == 0
+
+    def test_carries_steps_over_budget(self):
+        budget = StepBudget(0.0)
+        counter = Counter()
+
+        assert budget.take_steps(5, counter.step)
+
+        assert counter.count == 1
+        assert budget.carried_steps == 4
+        assert budget.steps_for(3) == 6
+        assert budget.steps_for(10) == 14
+
+    def test_carries_steps_that_cannot_be_taken(self):
+        budget = StepBudget(1000.0)
+        counter = Counter()
+
+        assert budget.take_steps(5, counter.step, lambda: counter.count < 2)
+
+        assert counter.count == 2
+        assert budget.carried_steps == 3
+
+    def test_end_drops_carried_steps(self):
+        budget = StepBudget(1000.0)
+        counter = Counter(limit=2)
+
+        assert not budget.take_steps(5, counter.step)
+
+        assert counter.count == 2
+        assert budget.carried_steps == 0
+
+    def test_drop_carried_steps(self):
+        budget = StepBudget(0.0)
+        budget.take_steps(5, Counter().step)
+
+        budget.drop_carried_steps()
+
+        assert budget.carried_steps == 0
+        assert budget.steps_for(3) == 3
+
+    def test_pop_stats(self):
+        budget = StepBudget(1000.0)
+        budget.take_steps(3, Counter().step)
+        budget.take_steps(2, Counter().step)
+
+        steps, seconds = budget.pop_stats()
+
+        assert steps == 5
+        assert seconds >= 0
+        assert budget.pop_stats() == (0, 0.0)
@@ -221,3 +221,35 @@ class TestGrid:
         assert grid.available_directions((1, 2)) == D.E | D.W
         assert grid.available_directions((0, 1)) == D.N | D.S
         assert grid.available_directions((2, 1)) == D.N | D.S
+
+    def test_index_of(self) -> None:
+        grid = Grid(4, 3)
+
+        assert grid.index_of((0, 0)) == 0
+        assert grid.index_of((3, 0)) == 3
+        assert grid.index_of((0, 1)) == 4
+        assert grid.index_of((3, 2)) == 11
+        assert grid.coordinate_of(0) == (0, 0)
+        assert grid.coordinate_of(4) == (0, 1)
+        assert grid.coordinate_of(11) == (3, 2)
+
+    def test_cells(self) -> None:
+        grid = Grid(3, 2)
+        grid.link((1, 1), D.N | D.W)
+
+        cells = grid.cells
+
+        assert len(cells) == 6
+        assert cells.readonly
+        assert list(cells) == [0, D.S, 0, D.E, D.N | D.W, 0]
+
+    def test_iteration_returns_directions(self) -> None:
+        grid = Grid(2, 2)
+        grid.link((0, 0), D.E)
+
+        cells = list(grid)
+
+        assert cells[0] == ((0, 0), D.E)
+        assert cells[1] == ((1, 0), D.W)
+        assert cells[2][1] is D.Empty
+        assert all(isinstance(dir, D) for _, dir in cells)
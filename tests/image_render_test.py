@@ -0,0 +1,85 @@
+import io
+import random
+
+import pytest
+from PIL import Image
+
+from mazes import Direction as D
+from mazes import Grid, Maze
+from mazes.algorithms.dijkstra import BulkDijkstra
+from mazes.distances import Distances
+from mazes.renderers.image_renderer import ImageRenderer
+
+
+class TestImageRenderer:
+    def test_empty_grid(self):
+        self.assert_same_image(ImageRenderer(Grid(3, 2)))
+
+    def test_links(self):
+        grid = Grid(3, 2)
+        grid.link((0, 0), D.E)
+        grid.link((1, 0), D.S)
+        grid.link((1, 1), D.E)
+
+        self.assert_same_image(ImageRenderer(grid, cell_size=4, padding=2))
+
+    def test_single_cell_distances(self):
+        grid = Grid(1, 1)
+        distances = Distances(1, 1, (0, 0))
+        distances[0, 0] = 0
+
+        self.assert_same_image(ImageRenderer(grid, distances))
+
+    @pytest.mark.parametrize("overlay", ["distances", "path", "longest"])
+    def test_overlays(self, overlay):
+        random.seed(7)
+        maze = Maze.generate(9, 6, Maze.AlgorithmType.RecursiveBacktracker)
+        dijkstra = BulkDijkstra(maze.grid, (0, 0))
+        dijkstra.generate()
+        match overlay:
+            case "distances":
+                distances = dijkstra.distances
+            case "path":
+                distances = dijkstra.path_to((4, 5))
+            case _:
+                distances = dijkstra.longest_path()
+
+        for cell_size, padding in [(2, 0), (5, 5), (7, 1)]:
+            self.assert_same_image(
+                ImageRenderer(
+                    maze.grid, distances, cell_size=cell_size, padding=padding
+                )
+            )
+
+    @pytest.mark.parametrize(
+        "overlay, gradient_end, mode",
+        [
+            (False, (0, 128, 128), "1"),
+            (True, (0, 128, 128), "P"),
+            # Too many distinct colors for a palette
+            (True, (255, 128, 64), "RGB"),
+        ],
+    )
+    def test_write_png(self, overlay, gradient_end, mode):
+        random.seed(3)
+        maze = Maze.generate(40, 30, Maze.AlgorithmType.RecursiveBacktracker)
+        dijkstra = BulkDijkstra(maze.grid, (0, 0))
+        dijkstra.generate()
+        distances = dijkstra.distances if overlay else None
+        renderer = ImageRenderer(maze.grid, distances, (0, 0, 0), gradient_end)
+        stream = io.BytesIO()
+
+        renderer.write_png(stream)
+
+        stream.seek(0)
+        image = Image.open(stream)
+        assert image.mode == mode
+        expected = renderer.render_png_image()
+        assert image.size == expected.size
+        assert image.convert("RGBA").tobytes() == expected.tobytes()
+
+    def assert_same_image(self, renderer: ImageRenderer) -> None:
+        expected = renderer.render_png_image()
+        actual = renderer.render_raster_image()
+        assert actual.size == expected.size
+        assert actual.tobytes() == expected.tobytes()
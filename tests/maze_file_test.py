@@ -0,0 +1,139 @@
+import io
+import random
+
+import pytest
+
+from mazes import AlgorithmType, Direction, Grid, ImmutableGrid, Maze
+from mazes.maze_file import (
+    MazeFileError,
+    MazeFileHeader,
+    load_maze_file,
+    read_maze,
+    write_maze,
+    write_maze_file,
+)
+
+
+class TestMazeFile:
+    @pytest.mark.parametrize("bits_per_cell", [4, 8])
+    @pytest.mark.parametrize("width, height", [(1, 1), (3, 5), (8, 6)])
+    def test_round_trip(self, bits_per_cell, width, height):
+        grid = self.generate(width, height)
+        stream = io.BytesIO()
+
+        write_maze(stream, grid, 42, AlgorithmType.Sidewinder, bits_per_cell)
+        stored = read_maze(stream.getvalue())
+
+        assert stored.header == MazeFileHeader(
+            width, height, 42, AlgorithmType.Sidewinder, bits_per_cell
+        )
+        assert bytes(stored.cells) == bytes(grid.cells)
+        assert list(stored) == list(grid)
+        assert stored[width - 1, height - 1] == grid[width - 1, height - 1]
+
+    def test_sizes(self):
+        grid = self.generate(5, 3)
+        wide = io.BytesIO()
+        packed = io.BytesIO()
+
+        write_maze(wide, grid)
+        write_maze(packed, grid, bits_per_cell=4)
+
+        assert len(wide.getvalue()) == 24 + 15
+        assert len(packed.getvalue()) == 24 + 8
+
+    def test_no_seed_or_algorithm(self):
+        stream = io.BytesIO()
+
+        write_maze(stream, Grid(2, 2))
+        stored = read_maze(stream.getvalue())
+
+        assert stored.header.seed is None
+        assert stored.header.algorithm is None
+
+    def test_cells_are_a_view(self):
+        stream = io.BytesIO()
+        write_maze(stream, self.generate(4, 4))
+        data = bytearray(stream.getvalue())
+
+        stored = read_maze(data)
+        data[24] = 0xF
+
+        assert stored.cells[0] == 0xF
+        assert stored.cells.readonly
+
+    @pytest.mark.parametrize("bits_per_cell", [4, 8])
+    def test_load_file(self, tmp_path, bits_per_cell):
+        grid = self.generate(7, 5)
+        path = tmp_path / "test.maze"
+        write_maze_file(path, grid, 7, AlgorithmType.BinaryTree, bits_per_cell)
+
+        with load_maze_file(path) as stored:
+            assert stored.header.seed == 7
+            assert stored.header.algorithm == AlgorithmType.BinaryTree
+            assert str(stored) == str(grid)
+
+    def test_invalid_files(self):
+        stream = io.BytesIO()
+        write_maze(stream, Grid(3, 3))
+        data = stream.getvalue()
+
+        with pytest.raises(MazeFileError):
+            read_maze(data[:10])
+        with pytest.raises(MazeFileError):
+            read_maze(b"MAZF" + data[4:])
+        with pytest.raises(MazeFileError):
+            read_maze(data[:-1])
+        with pytest.raises(MazeFileError):
+            read_maze(data[:6] + b"\xff" + data[7:])
+
+    @pytest.mark.parametrize(
+        "x, y, links",
+        [
+            (1, 1, 0x10),
+            (1, 0, Direction.N),
+            (1, 2, Direction.S),
+            (2, 1, Direction.E),
+            (0, 1, Direction.W),
+        ],
+    )
+    def test_invalid_cells(self, x, y, links):
+        stream = io.BytesIO()
+        write_maze(stream, Grid(3, 3))
+        data = bytearray(stream.getvalue())
+        data[24 + y * 3 + x] = links
+
+        with pytest.raises(MazeFileError):
+            read_maze(data)
+
+    def test_invalid_cell_past_first_chunk(self):
+        stream = io.BytesIO()
+        write_maze(stream, Grid(300, 300))
+        data = bytearray(stream.getvalue())
+        data[-1000] = 0x10
+
+        with pytest.raises(MazeFileError):
+            read_maze(data)
+
+    def test_load_invalid_file(self, tmp_path):
+        path = tmp_path / "test.maze"
+        path.write_bytes(b"MAZF" + bytes(20))
+
+        with pytest.raises(MazeFileError):
+            load_maze_file(path)
+
+    @pytest.mark.parametrize("bits_per_cell", [4, 8])
+    def test_load_invalid_cells(self, tmp_path, bits_per_cell):
+        path = tmp_path / "test.maze"
+        write_maze_file(path, Grid(3, 3), bits_per_cell=bits_per_cell)
+        data = bytearray(path.read_bytes())
+        data[24] = Direction.N << 4 if bits_per_cell == 4 else Direction.N
+        path.write_bytes(data)
+
+        with pytest.raises(MazeFileError):
+            load_maze_file(path)
+
+    def generate(self, width: int, height: int) -> ImmutableGrid:
+        random.seed(width * height)
+        maze = Maze.generate(width, height, Maze.AlgorithmType.RecursiveBacktracker)
+        return maze.grid
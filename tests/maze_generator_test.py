@@ -1,8 +1,11 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from mazes import AlgorithmType
 from mazes import Direction as D
-from mazes import Grid, MazeOptions
+from mazes import Grid, MazeGenerator, MazeOptions
 from mazes.core.maze_state import (
     MazeOperations,
     MazeOpGridLink,
@@ -27,6 +30,30 @@ class TestMazeGenerator:
         assert options.end == (1, 2)
         assert options.seed is None
 
+    def test_generate_without_steps(self) -> None:
+        options = MazeOptions(6, 4, AlgorithmType.BinaryTree, seed=1)
+        generator = MazeGenerator(options)
+
+        generator.generate()
+
+        grid = generator.grid
+        link_count = sum(bin(links).count("1") for _, links in grid)
+        assert link_count == 2 * (grid.width * grid.height - 1)
+
+    @pytest.mark.parametrize("algorithm", list(AlgorithmType))
+    def test_seed_is_reproducible_across_threads(self, algorithm) -> None:
+        def generate(seed: int) -> bytes:
+            generator = MazeGenerator(MazeOptions(12, 9, algorithm, seed=seed))
+            generator.generate()
+            return bytes(generator.grid.cells)
+
+        seeds = [1, 2, 3, 4] * 4
+        expected = [generate(seed) for seed in seeds]
+        random.seed(99)
+
+        with ThreadPoolExecutor(4) as executor:
+            assert list(executor.map(generate, seeds)) == expected
+
     def test_initial_state(self) -> None:
         state = self.make_state()
 
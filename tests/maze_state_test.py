@@ -374,6 +374,110 @@ class TestMazeState:
             MazeOpSetTargetCoords([]),
         ]
 
+    def test_headless_mutations(self) -> None:
+        state = self.make_state()
+        state.records_operations = False
+
+        state.set_target_coordinates([(1, 0), (0, 1)])
+        state.push_run((1, 0))
+        state.push_run((2, 0))
+        state.pop_run()
+        state.grid_link((0, 0), D.S)
+        state.set_distances((0, 0), 0)
+        state.set_distances((0, 1), 1)
+
+        step = state.pop_maze_step()
+        assert state.target_coordinates == [(1, 0), (0, 1)]
+        assert state.run == [(1, 0)]
+        assert state.grid[(0, 0)] == D.S
+        assert state.grid[(0, 1)] == D.N
+        assert state.distances[(0, 1)] == 1
+        assert state.max_distance == 1
+        assert state.max_coordinate == (0, 1)
+        assert step.forward_operations == []
+        assert step.backward_operations == []
+
+    def test_headless_constructor(self) -> None:
+        state = MutableMazeState(Grid(3, 3), (0, 0), records_operations=False)
+
+        state.grid_link((0, 0), D.E)
+        state.grid_unlink((0, 0), D.E)
+
+        assert not state.records_operations
+        assert state.grid[(0, 0)] == D.Empty
+        assert state.pop_maze_step().forward_operations == []
+
+    @pytest.mark.parametrize("records_operations", [True, False])
+    def test_set_lists_are_copied(self, records_operations: bool) -> None:
+        state = MutableMazeState(
+            Grid(3, 3), (0, 0), records_operations=records_operations
+        )
+        run = [(0, 0)]
+        targets = [(1, 0)]
+
+        state.set_run(run)
+        state.set_target_coordinates(targets)
+        state.push_run((0, 1))
+        run.append((2, 2))
+        targets.append((2, 2))
+
+        assert state.run == [(0, 0), (0, 1)]
+        assert state.target_coordinates == [(1, 0)]
+
+    def test_restore_snapshot(self) -> None:
+        state = self.make_state()
+        state.grid_link((0, 0), D.S)
+        state.push_run((0, 1))
+        state.set_distances((0, 0), 0)
+        state.pop_maze_step()
+        snapshot = state.snapshot()
+
+        state.grid_link((0, 1), D.E)
+        state.push_run((1, 1))
+        state.set_target_coordinates([(2, 1)])
+        state.set_distances((0, 1), 1)
+        state.set_distances((1, 1), 2)
+        state.restore(snapshot)
+
+        assert state.grid[(0, 1)] == D.N
+        assert state.run == [(0, 1)]
+        assert state.target_coordinates == []
+        assert state.distances[(0, 1)] is None
+        assert state.distances.max_distance == 0
+        assert state.max_distance == 0
+        assert state.max_coordinate == (0, 0)
+        assert state.pop_maze_step().forward_operations == []
+
+    def test_track_changes(self) -> None:
+        state = self.make_state()
+        state.push_run((0, 0))
+        assert state.pop_changes().coordinates == set()
+
+        state.tracks_changes = True
+        state.push_run((1, 0))
+        state.grid_link((1, 0), D.S)
+        state.set_target_coordinates([(2, 2)])
+        state.set_distances((3, 3), 0)
+        changes = state.pop_changes()
+
+        assert changes.coordinates == {(0, 0), (1, 0), (1, 1), (2, 2), (3, 3)}
+        assert changes.everything
+        assert state.pop_changes().coordinates == set()
+
+    def test_track_changes_when_undoing(self) -> None:
+        state = self.make_state()
+        state.push_run((0, 0))
+        state.push_run((1, 0))
+        step = state.pop_maze_step()
+        state.tracks_changes = True
+
+        for op in step.backward_operations:
+            state.apply_operation(op)
+        changes = state.pop_changes()
+
+        assert changes.coordinates == {(0, 0), (1, 0)}
+        assert not changes.everything
+
     def make_state(self) -> MutableMazeState:
         grid = Grid(5, 5)
         state = MutableMazeState(grid, (0, 0))
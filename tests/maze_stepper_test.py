@@ -1,7 +1,11 @@
+import random
 from collections.abc import Iterator
 
+import pytest
+
 from mazes import Direction as D
 from mazes import Grid, MazeStep, MazeStepper, MutableMazeState
+from mazes.algorithms import RecursiveBacktracker, RecursiveBacktrackerRandom
 
 
 class TestMazeStepper:
@@ -198,3 +202,64 @@ class TestMazeStepper:
 
         assert grid.available_directions((0, 0)) == D.S | D.E
         assert state.run == []
+
+    @pytest.mark.parametrize("keyframe_interval", [1, 7, None])
+    def test_seek(self, keyframe_interval: int | None) -> None:
+        grid = Grid(9, 7)
+        state = MutableMazeState(grid, (0, 0))
+        algorithm = RecursiveBacktracker(
+            state, RecursiveBacktrackerRandom(random.Random(2))
+        )
+        stepper = MazeStepper(state, algorithm.maze_steps(), keyframe_interval)
+
+        cells = [bytes(grid.cells)]
+        runs = [list(state.run)]
+        while stepper.step_forward():
+            cells.append(bytes(grid.cells))
+            runs.append(list(state.run))
+
+        for position in random.Random(3).choices(range(len(cells)), k=50):
+            assert stepper.seek(position) == position
+            assert stepper.position == position
+            assert bytes(grid.cells) == cells[position]
+            assert state.run == runs[position]
+
+    def test_seek_generates_steps(self) -> None:
+        grid = Grid(9, 7)
+        state = MutableMazeState(grid, (0, 0))
+        algorithm = RecursiveBacktracker(
+            state, RecursiveBacktrackerRandom(random.Random(2))
+        )
+        stepper = MazeStepper(state, algorithm.maze_steps(), keyframe_interval=4)
+
+        assert stepper.seek(10) == 10
+        assert len(stepper.log) == 10
+        end = stepper.seek(1_000_000)
+        assert end == len(stepper.log)
+        assert stepper.seek(0) == 0
+        assert bytes(grid.cells) == bytes(Grid(9, 7).cells)
+        assert stepper.seek(end) == end
+        assert not stepper.step_forward()
+
+    def test_seek_back_then_generate(self) -> None:
+        grid = Grid(40, 40)
+        state = MutableMazeState(grid, (0, 0))
+        algorithm = RecursiveBacktracker(
+            state, RecursiveBacktrackerRandom(random.Random(1))
+        )
+        stepper = MazeStepper(state, algorithm.maze_steps())
+
+        stepper.seek(1000)
+        stepper.seek(100)
+        stepper.step_forward_until_end()
+
+        link_count = sum(bin(links).count("1") for _, links in grid)
+        assert link_count == 2 * (grid.width * grid.height - 1)
+        assert all(links for _, links in grid)
+
+    def test_seek_negative(self) -> None:
+        state = MutableMazeState(Grid(2, 2), (0, 0))
+        stepper = MazeStepper(state, iter([]))
+
+        with pytest.raises(ValueError):
+            stepper.seek(-1)
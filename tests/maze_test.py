@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from mazes import Maze
+from mazes.algorithms import BulkDijkstra, TreeDiameter
+
+
+class TestMaze:
+    def test_nothing_skips_search(self, monkeypatch):
+        searches = self.count_searches(monkeypatch)
+
+        maze = Maze.generate(8, 6, Maze.AlgorithmType.BinaryTree)
+        str(maze)
+
+        assert maze.distances() is None
+        assert searches == []
+
+    @pytest.mark.parametrize(
+        "overlayType",
+        [
+            Maze.OverlayType.Distance,
+            Maze.OverlayType.PathTo,
+            Maze.OverlayType.PathToMax,
+            Maze.OverlayType.LongestPath,
+        ],
+    )
+    def test_overlay_is_computed_once(self, monkeypatch, tmp_path, overlayType):
+        maze = Maze.generate(8, 6, Maze.AlgorithmType.Sidewinder, overlayType)
+        searches = self.count_searches(monkeypatch)
+
+        distances = maze.distances()
+        str(maze)
+        maze.write_png(str(tmp_path / "maze.png"))
+
+        assert maze.distances() is distances
+        assert len(searches) == 1
+
+    def test_overlays_share_search(self, monkeypatch):
+        random.seed(2)
+        maze = Maze.generate(8, 6, Maze.AlgorithmType.RecursiveBacktracker)
+        searches = self.count_searches(monkeypatch)
+
+        path = maze.distances(Maze.OverlayType.PathTo)
+        path_to_max = maze.distances(Maze.OverlayType.PathToMax)
+
+        assert path is not None and path_to_max is not None
+        assert path[maze.grid.southeast_corner] is not None
+        assert searches == ["dijkstra"]
+
+    def count_searches(self, monkeypatch) -> list[str]:
+        searches: list[str] = []
+        dijkstra_generate = BulkDijkstra.generate
+        diameter_generate = TreeDiameter.generate
+
+        def generate_dijkstra(self):
+            searches.append("dijkstra")
+            dijkstra_generate(self)
+
+        def generate_diameter(self):
+            searches.append("diameter")
+            diameter_generate(self)
+
+        monkeypatch.setattr(BulkDijkstra, "generate", generate_dijkstra)
+        monkeypatch.setattr(TreeDiameter, "generate", generate_diameter)
+        return searches
@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from mazes import Direction as D
+from mazes import Grid, MazeStep, MazeStepper, MutableMazeState
+from mazes.algorithms import (
+    BulkRecursiveBacktracker,
+    Dijkstra,
+    RecursiveBacktracker,
+    RecursiveBacktrackerRandom,
+    Sidewinder,
+    SidewinderRandom,
+)
+from mazes.core.maze_state import (
+    MazeOperation,
+    MazeOpGridLink,
+    MazeOpGridUnlink,
+    MazeOpPopRun,
+    MazeOpPushRun,
+    MazeOpSetDistance,
+    MazeOpSetMaxDistance,
+    MazeOpSetRun,
+    MazeOpSetTargetCoords,
+    MazeOpSetTargetDirs,
+)
+from mazes.core.op_log import OpLog
+
+
+class TestOpLog:
+    def test_round_trips_every_operation(self) -> None:
+        forward: list[MazeOperation] = [
+            MazeOpPushRun((2, 3)),
+            MazeOpPopRun(),
+            MazeOpSetRun([(0, 0), (3, 1)]),
+            MazeOpSetRun([]),
+            MazeOpGridLink((1, 2), D.E),
+            MazeOpGridUnlink((3, 3), D.N | D.W),
+            MazeOpSetTargetCoords([(2, -1), (0, 4)]),
+            MazeOpSetTargetDirs(D.S),
+        ]
+        backward: list[MazeOperation] = [
+            MazeOpSetDistance((1, 1), 12),
+            MazeOpSetDistance((1, 1), None),
+            MazeOpSetMaxDistance((3, 0), 7),
+            MazeOpSetMaxDistance(None, None),
+        ]
+        log = OpLog(4)
+
+        log.append(MazeStep([], []))
+        log.append(MazeStep(forward, backward))
+
+        assert len(log) == 2
+        assert log.step(0) == MazeStep([], [])
+        assert log.step(1) == MazeStep(forward, backward)
+
+    def test_coordinate_beside_grid(self) -> None:
+        log = OpLog(4)
+
+        with pytest.raises(ValueError):
+            log.append(MazeStep([MazeOpPushRun((4, 0))], []))
+
+    @pytest.mark.parametrize("algorithm", ["sidewinder", "backtracker", "dijkstra"])
+    def test_replays_steps(self, algorithm: str) -> None:
+        grid = Grid(12, 9)
+        state = MutableMazeState(grid, (0, 0))
+        rng = random.Random(5)
+        match algorithm:
+            case "sidewinder":
+                steps = Sidewinder(state, SidewinderRandom(rng)).maze_steps()
+            case "backtracker":
+                steps = RecursiveBacktracker(
+                    state, RecursiveBacktrackerRandom(rng)
+                ).maze_steps()
+            case _:
+                BulkRecursiveBacktracker(
+                    grid, RecursiveBacktrackerRandom(rng)
+                ).generate()
+                steps = Dijkstra(grid, (0, 0), state).maze_steps()
+        stepper = MazeStepper(state, steps)
+
+        snapshots = [_snapshot(state)]
+        while stepper.step_forward():
+            snapshots.append(_snapshot(state))
+
+        for snapshot in reversed(snapshots[:-1]):
+            assert stepper.step_backward()
+            assert _snapshot(state) == snapshot
+        assert not stepper.step_backward()
+        for snapshot in snapshots[1:]:
+            assert stepper.step_forward()
+            assert _snapshot(state) == snapshot
+        assert not stepper.step_forward()
+
+
+def _snapshot(state: MutableMazeState) -> tuple:
+    return (
+        bytes(state.grid.cells),
+        list(state.run),
+        list(state.target_coordinates),
+        state.target_directions,
+        [state.distances[coordinate] for coordinate in state.grid.coordinates()],
+        state.max_distance,
+        state.max_coordinate,
+    )
@@ -0,0 +1,103 @@
+import io
+import random
+import textwrap
+
+import pytest
+
+from mazes import UNREACHED, Maze
+from mazes.algorithms.dijkstra import BulkDijkstra
+from mazes.renderers import TextParser, TextRenderer
+
+
+class TestTextParser:
+    def test_round_trip(self):
+        random.seed(11)
+        maze = Maze.generate(9, 7, Maze.AlgorithmType.RecursiveBacktracker)
+
+        grid, distances = TextParser.parse_text(str(maze))
+
+        assert bytes(grid.cells) == bytes(maze.grid.cells)
+        assert distances is None
+
+    def test_distances(self):
+        text = """
+            +---+---+---+
+            | 0   1 |   |
+            +---+   +---+
+            |   | 2   3 |
+            +---+---+---+
+            """
+
+        grid, distances = TextParser.parse_text(textwrap.dedent(text))
+
+        assert distances is not None
+        rendered = TextRenderer.render_grid(grid, distances)
+        assert rendered == textwrap.dedent(text).lstrip()
+        assert distances.root == (0, 0)
+        assert distances.max_coordinate == (2, 1)
+        assert list(distances.values) == [0, 1, UNREACHED, UNREACHED, 2, 3]
+
+    def test_distances_round_trip(self):
+        random.seed(5)
+        maze = Maze.generate(8, 5, Maze.AlgorithmType.Sidewinder)
+        dijkstra = BulkDijkstra(maze.grid, (3, 2))
+        dijkstra.generate()
+        expected = dijkstra.distances
+        stream = io.StringIO()
+        TextRenderer(maze.grid, expected).write(stream)
+        stream.seek(0)
+
+        grid, distances = TextParser().parse(stream)
+
+        assert bytes(grid.cells) == bytes(maze.grid.cells)
+        assert distances is not None
+        assert bytes(distances.values) == bytes(expected.values)
+        assert distances.root == (3, 2)
+        assert distances.max_distance == expected.max_distance
+
+    def test_large_distances_round_trip(self):
+        random.seed(8)
+        maze = Maze.generate(20, 15, Maze.AlgorithmType.RecursiveBacktracker)
+        dijkstra = BulkDijkstra(maze.grid, (0, 0))
+        dijkstra.generate()
+        expected = dijkstra.distances
+        assert expected.max_distance > 62
+        text = TextRenderer.render_grid(maze.grid, expected)
+        assert "!" in text
+
+        grid, distances = TextParser.parse_text(text)
+
+        assert bytes(grid.cells) == bytes(maze.grid.cells)
+        assert distances is not None
+        assert bytes(distances.values) == bytes(expected.values)
+        assert distances.max_coordinate == expected.max_coordinate
+
+    def test_large_distances_without_root(self):
+        text = "+---+---+\n| !   ! |\n+---+---+\n"
+
+        grid, distances = TextParser.parse_text(text)
+
+        assert grid.width == 2
+        assert distances is None
+
+    def test_without_distances(self):
+        text = "+---+---+\n| 0   1 |\n+---+---+\n"
+
+        _, distances = TextParser.parse_text(text, with_distances=False)
+
+        assert distances is None
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "",
+            "+---+--+\n",
+            "+---+\n+---+\n",
+            "+---+\n| 0 |\n",
+            "+---+\n| ? |\n+---+\n",
+            "+---+---+\n|   |\n+---+\n",
+        ],
+    )
+    def test_invalid_text(self, text):
+        with pytest.raises(ValueError):
+            TextParser.parse_text(text)
@@ -1,5 +1,7 @@
+import io
+
 from mazes import Direction as D
-from mazes import Grid
+from mazes import Distances, Grid
 from mazes.renderers.text_renderer import TextRenderer
 
 from .asserts import assert_render
@@ -81,5 +83,42 @@ class TestTextRenderer:
 
         assert_render(text, expected)
 
+    def test_distances(self):
+        grid = Grid(3, 2)
+        grid.link_path((0, 0), [D.E, D.S])
+        distances = Distances(3, 2, (0, 0))
+        distances[0, 0] = 0
+        distances[1, 0] = 1
+        distances[1, 1] = 2
+
+        text = TextRenderer.render_grid(grid, distances)
+
+        expected = """
+            +---+---+---+
+            | 0   1 |   |
+            +---+   +---+
+            |   | 2 |   |
+            +---+---+---+
+            """
+
+        assert_render(text, expected)
+
+    def test_write_streams_lines(self):
+        grid = Grid(3, 2)
+        grid.link_path((0, 0), [D.E, D.S, D.E])
+        renderer = TextRenderer(grid)
+        stream = io.StringIO()
+
+        renderer.write(stream)
+
+        assert stream.getvalue() == renderer.render()
+        assert list(renderer.lines()) == [
+            "+---+---+---+\n",
+            "|       |   |\n",
+            "+---+   +---+\n",
+            "|   |       |\n",
+            "+---+---+---+\n",
+        ]
+
     def render(self, grid: Grid) -> str:
         return TextRenderer.render_grid(grid)
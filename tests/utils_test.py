@@ -0,0 +1,15 @@
+from mazes.utils import bytewise_or
+
+
+class TestBytewiseOr:
+    def test_bytewise_or(self):
+        assert bytewise_or(b"\x01\x00\x0c", b"\x02\x00\x04") == b"\x03\x00\x0c"
+
+    def test_many(self):
+        parts = [bytes([1 << i]) * 3 for i in range(4)]
+
+        assert bytewise_or(*parts) == b"\x0f\x0f\x0f"
+
+    def test_leading_zeros(self):
+        assert bytewise_or(b"\x00\x00\x01", b"\x00\x00\x02") == b"\x00\x00\x03"
+        assert bytewise_or(b"") == b""